@@ -4,7 +4,49 @@ import re
 import urllib3
 import time
 import logging
-from typing import Literal, Dict, Any, Optional, Tuple, Union, Mapping, List, TypedDict
+import functools
+import sys
+import random
+from dataclasses import dataclass, replace
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import MappingProxyType
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import (
+    Literal,
+    Dict,
+    Any,
+    Optional,
+    Tuple,
+    Union,
+    Mapping,
+    List,
+    Set,
+    TypedDict,
+    Callable,
+    TypeVar,
+)
+
+# --- Optional fast JSON codec (falls back to the stdlib) ---
+# All of these accept the raw response bytes, so we never materialize response.text.
+# _json_dumps returns compact UTF-8 bytes for the app's own files.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    try:
+        import ujson
+
+        _json_loads = ujson.loads
+    except ImportError:
+        _json_loads = json.loads
 
 
 # --- SDK Specific Exceptions ---
@@ -18,10 +60,11 @@ class TflCycleHireSDKError(Exception):
 class TflCycleHireAPIError(TflCycleHireSDKError):
     """Raised for API-level errors (e.g., HTTP 4xx, 5xx)."""
 
-    def __init__(self, message, status_code=None, response_text=None):
+    def __init__(self, message, status_code=None, response_text=None, retry_after=None):
         super().__init__(message)
         self.status_code = status_code
         self.response_text = response_text
+        self.retry_after = retry_after  # Seconds, from a Retry-After header
 
 
 class TflCycleHireDataError(TflCycleHireSDKError):
@@ -40,6 +83,101 @@ class TflCycleHireConfigError(TflCycleHireSDKError):
 logger = logging.getLogger(__name__)
 
 
+# --- SSL Warnings ---
+# urllib3.disable_warnings() mutates the global warnings filter list; only do it
+# once per process rather than on every SDK instantiation.
+_ssl_warnings_disabled = False
+
+
+def _ensure_ssl_warnings_disabled() -> None:
+    global _ssl_warnings_disabled
+    if not _ssl_warnings_disabled:
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        _ssl_warnings_disabled = True
+
+
+def _fresh_client_time() -> str:
+    """Current time as the c3-clienttime string ("<seconds>.<microseconds>")."""
+    ns = time.time_ns()
+    return f"{ns // 1_000_000_000}.{ns // 1_000 % 1_000_000:06d}"
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _api_error_from_http_error(
+    http_err: requests.exceptions.HTTPError,
+) -> TflCycleHireAPIError:
+    response = http_err.response
+    return TflCycleHireAPIError(
+        str(http_err),
+        getattr(response, "status_code", None),
+        getattr(response, "text", None),
+        _parse_retry_after(
+            getattr(response, "headers", None) and response.headers.get("Retry-After")
+        ),
+    )
+
+
+def _client_time_age(c3_clienttime: str) -> Optional[float]:
+    """Seconds elapsed since a c3-clienttime string; None if unparseable."""
+    try:
+        return time.time() - float(c3_clienttime)
+    except ValueError:
+        return None
+
+
+# Shared read-only stand-in for a missing "Tags" mapping while parsing responses.
+_EMPTY_TAGS: Mapping[str, Any] = MappingProxyType({})
+
+
+# A planned token strategy: (label, c3_encoding, c3_clienttime, source_info).
+# A c3_clienttime of None means "fresh time when sent"; a source_info of None
+# means success leaves the active tokens as they are.
+_TokenStrategy = Tuple[str, str, Optional[str], Optional[str]]
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True)
+class RetryConfig:
+    """
+    Backoff for transient API errors, retried within a token strategy before
+    the next strategy is tried. Other errors (e.g. 401/403) are never retried.
+    """
+
+    max_retries: int = 3  # Retries after the first try
+    backoff_base: float = 1.0  # Seconds; doubled per retry
+    backoff_cap: float = 8.0  # Also the longest Retry-After we will wait out
+    jitter: float = 0.5  # Each delay is stretched by up to this fraction
+    statuses: Tuple[int, ...] = (429, 502, 503, 504)
+    # Confirm Hire is not idempotent: a 502/504 from a gateway does not mean
+    # the hire was not confirmed. Only these statuses are retried for it.
+    confirm_hire_statuses: Tuple[int, ...] = (429,)
+
+    def for_confirm_hire(self) -> "RetryConfig":
+        return replace(
+            self,
+            statuses=tuple(s for s in self.statuses if s in self.confirm_hire_statuses),
+        )
+
+    def delay(self, attempt: int) -> float:
+        return min(
+            self.backoff_cap,
+            self.backoff_base * 2**attempt * (1 + random.uniform(0, self.jitter)),
+        )
+
+
 # --- Define Location Data ---
 # This LocationKey is for the statically defined locations.
 # Search results will be identified by their own unique IDs (e.g., StationID).
@@ -69,6 +207,31 @@ DEFAULT_LOCATION_DATA: Dict[StaticallyDefinedLocationKey, Dict[str, str]] = {
     },
 }
 
+# Confirm Hire button node, as captured from the app. Already percent-encoded;
+# only the station fields are substituted in.
+_NODE_XML_TEMPLATE = """<Node Type%3D"Node.FormControls.Button" ID%3D"page_button1" SortOrder%3D"25" TTL%3D"3600" AliasMode%3D"Passive">
+<Name>Confirm hire<%2FName>
+<TreeMode>Leaf<%2FTreeMode>
+<Language><%2FLanguage>
+<TargetUri>part%3A%2F%2FClients.TfL.EBikePhase2.ConfirmMemberHire%3FTerminalName%3D{terminal_name}%26amp%3BPointName%3D{point_name_encoded}%26amp%3BLCHS_Confirm%3D1%26amp%3BnbBikes%3D(null)<%2FTargetUri>
+<Tags>
+<Tag key%3D"Style.Cell.ForegroundColor">#FFFFFF<%2FTag>
+<Tag key%3D"Style.Cell.BorderColor">#EE0000<%2FTag>
+<Tag key%3D"Style.Cell.CenterVertically">1<%2FTag>
+<Tag key%3D"Style.Cell.TextAlign">center<%2FTag>
+<Tag key%3D"Style.Cell.BackgroundBorderRadius">5%<%2FTag>
+<Tag key%3D"Style.Cell.Width">70%<%2FTag>
+<Tag key%3D"Style.Cell.Margin.BackgroundColor">#FFFFFF<%2FTag>
+<Tag key%3D"Style.Cell.BackgroundColor">#EE0000<%2FTag>
+<Tag key%3D"Style.Cell.BorderWidth">1px<%2FTag>
+<Tag key%3D"Style.Cell.HideNativeWidgets">1<%2FTag>
+<Tag key%3D"Style.Cell.Margin">50 40 40 40<%2FTag>
+<Tag key%3D"Style.Cell.FontSize">16px<%2FTag>
+<Tag key%3D"Style.Class">button_set page_button1<%2FTag>
+<Tag key%3D"Style.Cell.FontName">NJFont-Medium<%2FTag>
+<%2FTags>
+<%2FNode>"""
+
 # Structure for search results
 SearchedStationInfo = TypedDict(
     "SearchedStationInfo",
@@ -76,7 +239,7 @@ SearchedStationInfo = TypedDict(
         "station_id": str,
         "name": str,
         "subtitle": str,  # Availability info
-        "terminal_name": str,
+        "terminal_name": Optional[str],  # None when the station is not hirable
         "point_name": str,  # This is often the same as 'name' but good to have distinct
         "dock_location": Optional[str],  # Lat,Lon string
     },
@@ -88,6 +251,29 @@ class TflCycleHireSDK:
         "https://ce-a22.corethree.net/Workflows/HandleEventWithNode?format=json"
     )
     BASE_URL_CLIENTS_TFL = "https://ce-a22.corethree.net/Clients/TfL"  # For search
+    API_HOST = "ce-a22.corethree.net"
+
+    # Connection pool for the single Core3 host; keeps TLS connections warm
+    # across the strategy fallbacks instead of re-handshaking per request.
+    POOL_CONNECTIONS = 4
+    POOL_MAXSIZE = 16
+
+    # An encoding the API rejected outright (401/403) is not retried with a
+    # fresh client time for a short while; that attempt would be a wasted RTT.
+    AUTH_FAILURE_STATUSES = (401, 403)
+    AUTH_FAILURE_SKIP_SECONDS = 30.0
+    AUTH_FAILURE_PURGE_SECONDS = 300.0
+
+    # A fresh-time retry is pointless when the original client time tried just
+    # before it is itself this recent; the two requests would be equivalent.
+    FRESH_CLIENTTIME_SECONDS = 30.0
+
+    # Used when neither the constructor nor the call passes a RetryConfig.
+    DEFAULT_RETRY_CONFIG = RetryConfig()
+
+    # Patterns used while parsing responses; compiled once at class creation.
+    _RE_SEARCHRESULT_ID = re.compile(r"(lchs_searchresult_(\d+))")  # Used with .match
+    _RE_RELEASE_CODE = re.compile(r"Release code (\d+)")
 
     DEFAULT_CONFIG = {
         "user_agent": "Core/202503171232 (iOS; iPad14,1; iPadOS 18.3.2; uk.gov.tfl.cyclehire)",
@@ -102,31 +288,35 @@ class TflCycleHireSDK:
         "c3_deviceid": "555D91A6-5B1E-49BC-9624-1989B4DA4833",
         "event_name": "Click",  # For HandleEventWithNode
         "c3_controlvals": "cHTnp0wCbVOhbs12x8sR4+2I/8CVACvEd8Zn5e3Tpas=",
+        "verify_ssl": False,  # Core3 host presents a cert that fails default CA checks
+        # Past this age (seconds) the original client time is assumed expired
+        # server-side, so the original-time strategy gives way to a fresh time.
+        "active_token_ttl": 300.0,
     }
+    STATIC_LOCATION_REQUIRED_KEYS = frozenset(
+        ("terminal_name", "point_name", "c3_encoding", "c3_clienttime")
+    )
     DEFAULT_C3_USERAUTH = "564e7ff6ebbf80c4cafb4c7b7d3ea7bbc4435ad0|bcSxLxDWpaTC"
 
-    NODE_XML_TEMPLATE_CONFIRM_HIRE = """<Node Type%3D"Node.FormControls.Button" ID%3D"page_button1" SortOrder%3D"25" TTL%3D"3600" AliasMode%3D"Passive">
-<Name>Confirm hire<%2FName>
-<TreeMode>Leaf<%2FTreeMode>
-<Language><%2FLanguage>
-<TargetUri>part%3A%2F%2FClients.TfL.EBikePhase2.ConfirmMemberHire%3FTerminalName%3D{terminal_name}%26amp%3BPointName%3D{point_name_encoded}%26amp%3BLCHS_Confirm%3D1%26amp%3BnbBikes%3D(null)<%2FTargetUri>
-<Tags>
-<Tag key%3D"Style.Cell.ForegroundColor">#FFFFFF<%2FTag>
-<Tag key%3D"Style.Cell.BorderColor">#EE0000<%2FTag>
-<Tag key%3D"Style.Cell.CenterVertically">1<%2FTag>
-<Tag key%3D"Style.Cell.TextAlign">center<%2FTag>
-<Tag key%3D"Style.Cell.BackgroundBorderRadius">5%<%2FTag>
-<Tag key%3D"Style.Cell.Width">70%<%2FTag>
-<Tag key%3D"Style.Cell.Margin.BackgroundColor">#FFFFFF<%2FTag>
-<Tag key%3D"Style.Cell.BackgroundColor">#EE0000<%2FTag>
-<Tag key%3D"Style.Cell.BorderWidth">1px<%2FTag>
-<Tag key%3D"Style.Cell.HideNativeWidgets">1<%2FTag>
-<Tag key%3D"Style.Cell.Margin">50 40 40 40<%2FTag>
-<Tag key%3D"Style.Cell.FontSize">16px<%2FTag>
-<Tag key%3D"Style.Class">button_set page_button1<%2FTag>
-<Tag key%3D"Style.Cell.FontName">NJFont-Medium<%2FTag>
-<%2FTags>
-<%2FNode>"""
+    NODE_XML_TEMPLATE_CONFIRM_HIRE = _NODE_XML_TEMPLATE
+
+    # Fixed attribute layout: smaller instances and faster attribute access
+    # on the request paths. Add new instance attributes here.
+    __slots__ = (
+        "_c3_userauth",
+        "config",
+        "_applied_config",
+        "static_location_data",
+        "session",
+        "_confirm_hire_payload_template",
+        "_search_payload_template",
+        "_active_c3_encoding",
+        "_active_original_c3_clienttime",
+        "_active_token_source_info",
+        "_recent_auth_failures",
+        "_on_tokens_changed",
+        "retry_config",
+    )
 
     def __init__(
         self,
@@ -137,24 +327,142 @@ class TflCycleHireSDK:
         sdk_config: Optional[Dict[str, Any]] = None,
         disable_ssl_warnings: bool = True,
         session: Optional[requests.Session] = None,
+        on_tokens_changed: Optional[Callable[[str, str, str], None]] = None,
+        retry_config: Optional[RetryConfig] = None,
     ):
         self.c3_userauth = c3_userauth
+        # Called as (c3_encoding, original_c3_clienttime, source_info) whenever
+        # set_active_tokens() runs, e.g. to persist working tokens.
+        self._on_tokens_changed = on_tokens_changed
+        self.retry_config = retry_config or self.DEFAULT_RETRY_CONFIG
         self.config = {**self.DEFAULT_CONFIG, **(sdk_config or {})}
-        self.static_location_data = dict(
-            static_location_data_map or DEFAULT_LOCATION_DATA
-        )
+        static_location_data_map = static_location_data_map or DEFAULT_LOCATION_DATA
+        # Validated once here so the per-call paths can index entries directly.
+        for key, details in static_location_data_map.items():
+            missing = self.STATIC_LOCATION_REQUIRED_KEYS.difference(details)
+            if missing:
+                raise TflCycleHireConfigError(
+                    f"Static location '{key}' is missing required keys: {sorted(missing)}"
+                )
+        # Copy each entry and intern the station fields, so the node XML cache
+        # keys for the preloaded stations compare by identity.
+        self.static_location_data = {
+            key: {
+                **details,
+                "terminal_name": sys.intern(details["terminal_name"]),
+                "point_name": sys.intern(details["point_name"]),
+            }
+            for key, details in static_location_data_map.items()
+        }
 
         if disable_ssl_warnings:
-            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+            _ensure_ssl_warnings_disabled()
 
-        self.session = session or requests.Session()
-        self.session.headers["User-Agent"] = self.config["user_agent"]
+        self.session = session if session is not None else self.build_session()
+        self._apply_config()
 
         self._active_c3_encoding: Optional[str] = None
         self._active_original_c3_clienttime: Optional[str] = None
         self._active_token_source_info: Optional[str] = None
+        # c3_encoding -> time.monotonic() of its last 401/403 rejection
+        self._recent_auth_failures: Dict[str, float] = {}
+
+        # The static stations' node XML never changes; render it up front.
+        for details in self.static_location_data.values():
+            self._render_confirm_hire_node(
+                details["terminal_name"], details["point_name"]
+            )
 
-        logger.info(f"SDK initialized. UserAuth (partial): {self.c3_userauth[:10]}...")
+        logger.info("SDK initialized. UserAuth (partial): %s...", self.c3_userauth[:10])
+
+    @classmethod
+    def build_session(cls) -> requests.Session:
+        """
+        A requests.Session with the SDK's connection pool mounted; used when no
+        session is passed in. Build one yourself to share the pool between
+        several SDK instances.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=cls.POOL_CONNECTIONS,
+            pool_maxsize=cls.POOL_MAXSIZE,
+            pool_block=False,
+            # Connect errors only: the request never left, so even a Confirm
+            # Hire POST is safe to resend. After a read timeout the hire may
+            # already have gone through; HTTP statuses are _call_with_retry's.
+            max_retries=Retry(
+                total=2, connect=2, read=0, status=0, other=0, backoff_factor=0.1
+            ),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @property
+    def c3_userauth(self) -> str:
+        return self._c3_userauth
+
+    @c3_userauth.setter
+    def c3_userauth(self, value: str) -> None:
+        self._c3_userauth = value
+        self._applied_config = None  # Rebuild the payload templates on the next call
+
+    def update_config(self, **changes: Any) -> None:
+        """Changes config values and applies them right away."""
+        self.config.update(changes)
+        self._apply_config()
+
+    def _ensure_config_applied(self) -> None:
+        # config is a plain dict callers may edit in place; one comparison per
+        # request picks such edits up before anything derived from it is sent.
+        if self._applied_config != self.config:
+            self._apply_config()
+
+    def _apply_config(self) -> None:
+        """Rebuilds the session settings and payload templates from the config."""
+        config = self.config
+        self.session.verify = config["verify_ssl"]
+        # Static headers live on the session; only c3-encoding varies per call.
+        self.session.headers.update(
+            {
+                "User-Agent": config["user_agent"],
+                "Host": self.API_HOST,
+                "Accept": "*/*",
+                "Accept-Language": config["accept_language"],
+                "Connection": "keep-alive",
+            }
+        )
+
+        # Payload fields that only change with the config or c3_userauth; the
+        # per-call builders only add the fields that vary between requests.
+        self._confirm_hire_payload_template = {
+            "c3-language": config["c3_language"],
+            "c3-applysensitivedatacheck": config["c3_applysensitivedatacheck"],
+            "c3-scalefactor": config["c3_scalefactor"],
+            "c3-capabilities": config["c3_capabilities"],
+            "c3-batterylevel": config["c3_batterylevel"],
+            "c3-userlat": config["c3_userlat"],
+            "c3-deviceid": config["c3_deviceid"],
+            "c3-userlong": config["c3_userlong"],
+            "Event": config["event_name"],
+            "c3-controlvals": config["c3_controlvals"],
+            "c3-userauth": self.c3_userauth,
+        }
+        self._search_payload_template = {
+            "c3-scalefactor": config["c3_scalefactor"],
+            "c3-userlat": config["c3_userlat"],
+            "c3-userlong": config["c3_userlong"],
+            "c3-batterylevel": config["c3_batterylevel"],
+            "c3-language": config["c3_language"],
+            "c3-applysensitivedatacheck": config["c3_applysensitivedatacheck"],
+            "c3-userauth": self.c3_userauth,
+            "c3-controlvals": config["c3_controlvals"],
+            "c3-capabilities": config["c3_capabilities"],
+            "c3-deviceid": config["c3_deviceid"],
+            "postback": "1",
+            "format": "json",
+        }
+        self._applied_config = dict(config)
 
     @property
     def active_token_info(self) -> Dict[str, Optional[str]]:
@@ -169,23 +477,15 @@ class TflCycleHireSDK:
     ) -> bool:
         if location_key not in self.static_location_data:
             logger.error(
-                f"Cannot prime tokens: Static Location key '{location_key}' not found."
+                "Cannot prime tokens: Static Location key '%s' not found.", location_key
             )
             return False
         loc_details = self.static_location_data[location_key]
-        if "c3_encoding" in loc_details and "c3_clienttime" in loc_details:
-            self._active_c3_encoding = loc_details["c3_encoding"]
-            self._active_original_c3_clienttime = loc_details["c3_clienttime"]
-            self._active_token_source_info = f"static_example_for_{location_key}"
-            logger.info(
-                f"SDK active tokens primed from static data for '{location_key}'."
-            )
-            return True
-        else:  # Should not happen with default data
-            logger.warning(
-                f"Cannot prime tokens: Missing token data for '{location_key}' in static_location_data."
-            )
-            return False
+        self._active_c3_encoding = loc_details["c3_encoding"]
+        self._active_original_c3_clienttime = loc_details["c3_clienttime"]
+        self._active_token_source_info = f"static_example_for_{location_key}"
+        logger.info("SDK active tokens primed from static data for '%s'.", location_key)
+        return True
 
     def set_active_tokens(
         self,
@@ -196,7 +496,14 @@ class TflCycleHireSDK:
         self._active_c3_encoding = c3_encoding
         self._active_original_c3_clienttime = original_c3_clienttime
         self._active_token_source_info = source_info
-        logger.info(f"SDK active tokens explicitly set. Source: {source_info}.")
+        logger.info("SDK active tokens explicitly set. Source: %s.", source_info)
+        if self._on_tokens_changed is not None:
+            try:
+                self._on_tokens_changed(
+                    c3_encoding, original_c3_clienttime, source_info
+                )
+            except Exception as e:  # A listener must never break a hire
+                logger.warning("on_tokens_changed callback failed: %s", e)
 
     def clear_active_tokens(self):
         self._active_c3_encoding = None
@@ -204,16 +511,43 @@ class TflCycleHireSDK:
         self._active_token_source_info = None
         logger.info("SDK active tokens cleared.")
 
-    def _build_confirm_hire_node_xml(
-        self, terminal_name: str, point_name_display: str
-    ) -> str:
-        point_name_encoded = point_name_display.replace(
-            ",", "%2C"
-        )  # As per previous findings
-        return self.NODE_XML_TEMPLATE_CONFIRM_HIRE.format(
+    def set_active_token_ttl(self, seconds: Optional[float]):
+        """
+        Sets how old the active client time may be before the original-time
+        strategy is skipped in favour of a fresh time; None always tries it.
+        """
+        self.config["active_token_ttl"] = seconds
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _render_confirm_hire_node(terminal_name: str, point_name_display: str) -> str:
+        """Renders the Confirm Hire node XML. Pure, so memoized per station."""
+        # Only commas are escaped, as in the captured requests; escaping other
+        # punctuation would change the TargetUri the server sees.
+        point_name_encoded = point_name_display.replace(",", "%2C")
+        return _NODE_XML_TEMPLATE.format(
             terminal_name=terminal_name, point_name_encoded=point_name_encoded
         )
 
+    def _record_strategy_failure(self, c3_encoding: str, error: Exception) -> None:
+        """Remembers encodings the API rejected as unauthorized."""
+        if not (
+            isinstance(error, TflCycleHireAPIError)
+            and error.status_code in self.AUTH_FAILURE_STATUSES
+        ):
+            return
+        now = time.monotonic()
+        self._recent_auth_failures[c3_encoding] = now
+        for encoding, failed_at in list(self._recent_auth_failures.items()):
+            if now - failed_at > self.AUTH_FAILURE_PURGE_SECONDS:
+                del self._recent_auth_failures[encoding]
+
+    def _encoding_recently_rejected(self, c3_encoding: str) -> bool:
+        failed_at = self._recent_auth_failures.get(c3_encoding)
+        if failed_at is None:
+            return False
+        return time.monotonic() - failed_at < self.AUTH_FAILURE_SKIP_SECONDS
+
     def _execute_confirm_hire_api_call(
         self,
         terminal_name: str,
@@ -223,31 +557,19 @@ class TflCycleHireSDK:
         timeout: int,
     ) -> str:
         """Internal method for the 'confirm hire and get code' API call."""
-        headers = {
-            "Host": "ce-a22.corethree.net",
-            "Accept": "*/*",
-            "c3-encoding": c3_encoding,
-            "Accept-Language": self.config["accept_language"],
-        }
-        node_xml = self._build_confirm_hire_node_xml(terminal_name, point_name)
+        self._ensure_config_applied()
+        headers = {"c3-encoding": c3_encoding}
+        node_xml = self._render_confirm_hire_node(terminal_name, point_name)
         payload = {
+            **self._confirm_hire_payload_template,
             "c3-clienttime": c3_clienttime,
-            "c3-language": self.config["c3_language"],
-            "c3-applysensitivedatacheck": self.config["c3_applysensitivedatacheck"],
-            "c3-scalefactor": self.config["c3_scalefactor"],
             "Node": node_xml,
-            "c3-capabilities": self.config["c3_capabilities"],
-            "c3-batterylevel": self.config["c3_batterylevel"],
-            "c3-userlat": self.config["c3_userlat"],
-            "c3-deviceid": self.config["c3_deviceid"],
-            "c3-userlong": self.config["c3_userlong"],
-            "Event": self.config["event_name"],
-            "c3-controlvals": self.config["c3_controlvals"],
-            "c3-userauth": self.c3_userauth,
         }
 
         logger.debug(
-            f"Executing Confirm Hire API call for: {point_name} (Terminal: {terminal_name})"
+            "Executing Confirm Hire API call for: %s (Terminal: %s)",
+            point_name,
+            terminal_name,
         )
         response_obj = None
         try:
@@ -255,45 +577,41 @@ class TflCycleHireSDK:
                 self.BASE_URL_WORKFLOWS,
                 headers=headers,
                 data=payload,
-                verify=False,
                 timeout=timeout,
             )
             response_obj.raise_for_status()
-            data = response_obj.json()
+            data = _json_loads(response_obj.content)
         # ... (Robust error handling as in previous _execute_api_call) ...
         except requests.exceptions.HTTPError as http_err:
-            raise TflCycleHireAPIError(
-                str(http_err),
-                getattr(http_err.response, "status_code", None),
-                getattr(http_err.response, "text", None),
-            ) from http_err
+            raise _api_error_from_http_error(http_err) from http_err
         except requests.exceptions.RequestException as req_err:
             raise TflCycleHireSDKError(f"Request failed: {req_err}") from req_err
-        except json.JSONDecodeError as json_err:
+        except ValueError as json_err:  # Covers json/orjson/ujson decode errors
             raise TflCycleHireAPIError(
                 "Failed to decode JSON response.",
                 getattr(response_obj, "status_code", None),
                 getattr(response_obj, "text", None),
             ) from json_err
 
-        release_code_found: Optional[str] = (
-            None  # Logic from previous _execute_api_call
-        )
-        children = data.get("Children", [])
-        for child in children:
-            if (
-                child.get("Name") == "Your cycle hire release code:"
-                and "Subtitle" in child
-            ):
+        # Single pass: the labelled code wins; the first unlockbar code found
+        # along the way is kept as a fallback.
+        release_code_found: Optional[str] = None
+        unlockbar_code: Optional[str] = None
+        for child in data.get("Children", []):
+            name = child.get("Name")
+            if name == "Your cycle hire release code:" and "Subtitle" in child:
                 release_code_found = child.get("Subtitle")
-                break
-        if not release_code_found:
-            for child in children:
-                if child.get("ID", "").endswith("_unlockbar") and "Name" in child:
-                    match = re.search(r"Release code (\d+)", child.get("Name", ""))
-                    if match:
-                        release_code_found = match.group(1)
-                        break
+                if release_code_found:
+                    break
+            elif (
+                unlockbar_code is None
+                and name
+                and child.get("ID", "").endswith("_unlockbar")
+            ):
+                match = self._RE_RELEASE_CODE.search(name)
+                if match:
+                    unlockbar_code = match.group(1)
+        release_code_found = release_code_found or unlockbar_code
         if release_code_found:
             return release_code_found
         else:
@@ -301,6 +619,219 @@ class TflCycleHireSDK:
                 f"Could not find release code for {point_name}."
             )
 
+    def _plan_active_token_strategies(
+        self,
+        try_active_original_time: bool,
+        try_active_fresh_time: bool,
+        fresh_time_source_info: str,
+        label_suffix: str = "",
+    ) -> List[_TokenStrategy]:
+        """Plans the strategies that reuse the SDK's active tokens."""
+        plan: List[_TokenStrategy] = []
+        if not self._active_c3_encoding:
+            return plan
+        original_time = self._active_original_c3_clienttime
+        # Only skipped when a fresh-time strategy follows; otherwise the stale
+        # time is still the one attempt left.
+        if (
+            try_active_original_time
+            and original_time
+            and try_active_fresh_time
+            and not self._is_clienttime_fresh(original_time)
+        ):
+            logger.info("Skipping original-time strategy: active client time is stale.")
+            try_active_original_time = False
+        if try_active_original_time and original_time:
+            plan.append(
+                (
+                    "active original time" + label_suffix,
+                    self._active_c3_encoding,
+                    original_time,
+                    None,
+                )
+            )
+            age = _client_time_age(original_time)
+            if (
+                try_active_fresh_time
+                and age is not None
+                and 0 <= age < self.FRESH_CLIENTTIME_SECONDS
+            ):
+                logger.debug(
+                    "Skipping fresh-time strategy: active client time is %.1fs old.",
+                    age,
+                )
+                try_active_fresh_time = False
+        if try_active_fresh_time:
+            plan.append(
+                (
+                    "active fresh time" + label_suffix,
+                    self._active_c3_encoding,
+                    None,
+                    fresh_time_source_info,
+                )
+            )
+        return plan
+
+    def _is_clienttime_fresh(self, c3_clienttime: str) -> bool:
+        """Unparseable times count as fresh; the server is the judge of those."""
+        ttl = self.config["active_token_ttl"]
+        if ttl is None:
+            return True
+        age = _client_time_age(c3_clienttime)
+        return age is None or age <= ttl
+
+    def _skip_strategy(self, label: str, c3_encoding: str) -> bool:
+        """Fresh-time retries are pointless for an encoding just rejected."""
+        if self._encoding_recently_rejected(c3_encoding):
+            logger.info("Strategy (%s) skipped: encoding was recently rejected.", label)
+            return True
+        return False
+
+    def _call_with_retry(
+        self, retry: RetryConfig, fn: Callable[..., _T], *args: Any
+    ) -> _T:
+        """Calls fn, retrying transient API errors (retry.statuses) with backoff."""
+        attempt = 0
+        while True:
+            try:
+                return fn(*args)
+            except TflCycleHireAPIError as e:
+                if e.status_code not in retry.statuses or attempt == retry.max_retries:
+                    raise
+                if e.retry_after is not None:
+                    delay = e.retry_after
+                    if delay > retry.backoff_cap:
+                        raise  # Server wants us gone for longer than we will wait
+                else:
+                    delay = retry.delay(attempt)
+                logger.info(
+                    "Transient API error (%s); retrying in %.2fs (attempt %d/%d).",
+                    e.status_code,
+                    delay,
+                    attempt + 1,
+                    retry.max_retries,
+                )
+                time.sleep(delay)
+                attempt += 1
+
+    def _send_strategy(
+        self,
+        retry: RetryConfig,
+        request: Callable[[str, str], _T],
+        c3_encoding: str,
+        c3_clienttime: Optional[str],
+    ) -> Tuple[_T, str]:
+        """
+        Sends one strategy's request with retries and returns (result, client
+        time sent). A c3_clienttime of None is stamped fresh on every send,
+        including after a backoff sleep.
+        """
+
+        def send() -> Tuple[_T, str]:
+            sent_time = c3_clienttime or _fresh_client_time()
+            return request(c3_encoding, sent_time), sent_time
+
+        return self._call_with_retry(retry, send)
+
+    def _run_token_strategies(
+        self,
+        plan: List[_TokenStrategy],
+        request: Callable[[str, str], _T],
+        final_msg: str,
+        no_strategy_msg: str,
+        retry_config: Optional[RetryConfig] = None,
+    ) -> _T:
+        """Tries the planned strategies in order and returns the first result."""
+        retry = retry_config or self.retry_config
+        last_error: Optional[Exception] = None
+        for label, c3_encoding, c3_clienttime, source_info in plan:
+            if c3_clienttime is None and self._skip_strategy(label, c3_encoding):
+                continue
+            logger.info(
+                "Strategy (%s): trying (client time %s).",
+                label,
+                c3_clienttime or "fresh",
+            )
+            try:
+                result, c3_clienttime = self._send_strategy(
+                    retry, request, c3_encoding, c3_clienttime
+                )
+            except Exception as e:
+                logger.warning("Strategy (%s) failed: %s", label, e)
+                self._record_strategy_failure(c3_encoding, e)
+                last_error = e
+                continue
+            if source_info is not None:
+                self.set_active_tokens(c3_encoding, c3_clienttime, source_info)
+            return result
+        if last_error:
+            raise TflCycleHireSDKError(final_msg) from last_error
+        if plan:  # Every strategy was skipped for a recently rejected encoding
+            raise TflCycleHireSDKError(
+                f"{final_msg} The active encoding was rejected by the API moments ago."
+            )
+        raise TflCycleHireConfigError(f"{final_msg} {no_strategy_msg}")
+
+    def _race_token_strategies(
+        self,
+        plan: List[_TokenStrategy],
+        request: Callable[[str, str], _T],
+        final_msg: str,
+        no_strategy_msg: str,
+        retry_config: Optional[RetryConfig] = None,
+    ) -> _T:
+        """
+        Like _run_token_strategies, but sends all planned attempts at once and
+        returns the first success. Losing attempts are left to finish in the
+        background and ignored.
+        """
+        attempts = [
+            strategy
+            for strategy in plan
+            if strategy[2] is not None or not self._skip_strategy(*strategy[:2])
+        ]
+        if not attempts:
+            if plan:  # Every strategy was skipped for a recently rejected encoding
+                raise TflCycleHireSDKError(
+                    f"{final_msg} The active encoding was rejected by the API moments ago."
+                )
+            raise TflCycleHireConfigError(f"{final_msg} {no_strategy_msg}")
+
+        logger.info("Strategy: Racing %d token strategies concurrently.", len(attempts))
+        # Each attempt is sent once: cancel() cannot stop a running future, so a
+        # losing attempt's retries would keep confirming hires after the winner.
+        retry = replace(retry_config or self.retry_config, max_retries=0)
+        executor = ThreadPoolExecutor(max_workers=len(attempts))
+        try:
+            futures = {
+                executor.submit(
+                    self._send_strategy,
+                    retry,
+                    request,
+                    attempt[1],
+                    attempt[2],
+                ): attempt
+                for attempt in attempts
+            }
+            last_error: Optional[Exception] = None
+            for future in as_completed(futures):
+                label, c3_encoding, _, source_info = futures[future]
+                try:
+                    result, c3_clienttime = future.result()
+                except Exception as e:
+                    logger.warning("Strategy (%s) failed: %s", label, e)
+                    self._record_strategy_failure(c3_encoding, e)
+                    last_error = e
+                    continue
+                for other in futures:
+                    other.cancel()
+                if source_info is not None:
+                    self.set_active_tokens(c3_encoding, c3_clienttime, source_info)
+                return result
+            raise TflCycleHireSDKError(final_msg) from last_error
+        finally:
+            executor.shutdown(wait=False)
+
     def get_release_code_with_explicit_tokens(
         self,
         terminal_name: str,  # Now takes terminal_name and point_name directly
@@ -311,7 +842,9 @@ class TflCycleHireSDK:
         update_active_tokens_on_success: bool = True,
     ) -> str:
         logger.info(
-            f"Attempting code retrieval for '{point_name}' (Terminal: {terminal_name}) with explicit tokens."
+            "Attempting code retrieval for '%s' (Terminal: %s) with explicit tokens.",
+            point_name,
+            terminal_name,
         )
         code = self._execute_confirm_hire_api_call(
             terminal_name, point_name, c3_encoding, c3_clienttime, timeout
@@ -330,13 +863,22 @@ class TflCycleHireSDK:
         try_active_original_time: bool = True,
         try_active_fresh_time: bool = True,
         try_static_location_tokens: bool = True,
+        parallel_strategies: bool = False,
+        retry_config: Optional[RetryConfig] = None,
     ) -> str:
-        """Gets release code for a statically defined location using various token strategies."""
+        """
+        Gets release code for a statically defined location using various token strategies.
+
+        With parallel_strategies=True the enabled strategies are sent at once and
+        the first success wins, so a stale token costs max(timeouts) rather than
+        their sum. Note this may send more than one Confirm Hire request.
+
+        retry_config overrides the SDK's backoff for transient errors on this call;
+        only its confirm_hire_statuses are retried, since a hire is not idempotent.
+        """
         logger.info(
-            f"Smart attempt for release code at static location '{location_key}'."
+            "Smart attempt for release code at static location '%s'.", location_key
         )
-        last_error: Optional[Exception] = None
-
         if location_key not in self.static_location_data:
             raise TflCycleHireConfigError(
                 f"Static location key '{location_key}' not found in SDK's static_location_data."
@@ -346,177 +888,124 @@ class TflCycleHireSDK:
         target_terminal_name = target_loc_details["terminal_name"]
         target_point_name = target_loc_details["point_name"]
 
-        # Strategy 1: Active tokens with original client time
-        if (
-            try_active_original_time
-            and self._active_c3_encoding
-            and self._active_original_c3_clienttime
-        ):
-            logger.info("Strategy: Trying active SDK tokens (original time).")
-            try:
-                code = self._execute_confirm_hire_api_call(
-                    target_terminal_name,
-                    target_point_name,
-                    self._active_c3_encoding,
-                    self._active_original_c3_clienttime,
-                    timeout,
-                )
-                return code
-            except Exception as e:
-                logger.warning(f"Strategy (active original time) failed: {e}")
-                last_error = e
-
-        # Strategy 2: Active encoding with fresh client time
-        if try_active_fresh_time and self._active_c3_encoding:
-            fresh_client_time = f"{time.time():.6f}"
-            logger.info(
-                f"Strategy: Trying active SDK encoding with FRESH time ({fresh_client_time})."
-            )
-            try:
-                code = self._execute_confirm_hire_api_call(
-                    target_terminal_name,
-                    target_point_name,
-                    self._active_c3_encoding,
-                    fresh_client_time,
-                    timeout,
-                )
-                self.set_active_tokens(
-                    self._active_c3_encoding,
-                    fresh_client_time,
-                    f"active_encoding_fresh_time_for_static_{location_key}",
-                )
-                return code
-            except Exception as e:
-                logger.warning(f"Strategy (active fresh time) failed: {e}")
-                last_error = e
-
-        # Strategy 3: Static/example tokens for the *target* location
+        # Strategies 1-2: active tokens (original, then fresh client time);
+        # Strategy 3: static/example tokens for the *target* location.
+        plan = self._plan_active_token_strategies(
+            try_active_original_time,
+            try_active_fresh_time,
+            f"active_encoding_fresh_time_for_static_{location_key}",
+        )
         if try_static_location_tokens:
-            if (
-                "c3_encoding" in target_loc_details
-                and "c3_clienttime" in target_loc_details
-            ):
-                logger.info(
-                    f"Strategy: Trying static/example tokens for target static location '{location_key}'."
-                )
-                try:
-                    code = self._execute_confirm_hire_api_call(
-                        target_terminal_name,
-                        target_point_name,
-                        target_loc_details["c3_encoding"],
-                        target_loc_details["c3_clienttime"],
-                        timeout,
-                    )
-                    self.set_active_tokens(
-                        target_loc_details["c3_encoding"],
-                        target_loc_details["c3_clienttime"],
-                        f"static_example_for_{location_key}",
-                    )
-                    return code
-                except Exception as e:
-                    logger.warning(f"Strategy (static location tokens) failed: {e}")
-                    last_error = e
-            else:
-                logger.warning(
-                    f"Strategy (static location tokens): Missing token data for '{location_key}'."
+            plan.append(
+                (
+                    "static location tokens",
+                    target_loc_details["c3_encoding"],
+                    target_loc_details["c3_clienttime"],
+                    f"static_example_for_{location_key}",
                 )
+            )
 
-        final_msg = f"All token strategies failed for static location '{location_key}'."
-        if last_error:
-            raise TflCycleHireSDKError(final_msg) from last_error
-        else:
-            raise TflCycleHireConfigError(
-                final_msg + " No valid strategies enabled or configured."
+        def request(c3_encoding: str, c3_clienttime: str) -> str:
+            return self._execute_confirm_hire_api_call(
+                target_terminal_name,
+                target_point_name,
+                c3_encoding,
+                c3_clienttime,
+                timeout,
             )
 
+        run = (
+            self._race_token_strategies
+            if parallel_strategies
+            else self._run_token_strategies
+        )
+        return run(
+            plan,
+            request,
+            f"All token strategies failed for static location '{location_key}'.",
+            "No valid strategies enabled or configured.",
+            (retry_config or self.retry_config).for_confirm_hire(),
+        )
+
     def _execute_search_api_call(
         self, search_text: str, c3_encoding: str, c3_clienttime: str, timeout: int
     ) -> List[SearchedStationInfo]:
         """Internal method to execute the station search API call and parse results."""
+        self._ensure_config_applied()
         search_url = f"{self.BASE_URL_CLIENTS_TFL}/GenerateLCHSDynamicSearch"
-        headers = {
-            "Host": "ce-a22.corethree.net",
-            "Accept": "*/*",
-            "c3-encoding": c3_encoding,
-            "Accept-Language": self.config["accept_language"],
-        }
+        headers = {"c3-encoding": c3_encoding}
         payload = {
+            **self._search_payload_template,
             "c3-clienttime": c3_clienttime,
-            "c3-scalefactor": self.config["c3_scalefactor"],
-            "c3-userlat": self.config["c3_userlat"],
-            "c3-userlong": self.config["c3_userlong"],
-            "c3-batterylevel": self.config["c3_batterylevel"],
-            "c3-language": self.config["c3_language"],
-            "c3-applysensitivedatacheck": self.config["c3_applysensitivedatacheck"],
-            "c3-userauth": self.c3_userauth,
-            "c3-controlvals": self.config["c3_controlvals"],
-            "c3-capabilities": self.config["c3_capabilities"],
-            "c3-deviceid": self.config["c3_deviceid"],
             "lchs_search_text": search_text,
-            "postback": "1",
-            "format": "json",
         }
-        logger.debug(f"Executing Search API call for: '{search_text}'")
-        logger.debug(f"  Search c3-encoding (partial): {c3_encoding[:15]}...")
-        logger.debug(f"  Search c3-clienttime: {c3_clienttime}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Executing Search API call for: '%s'", search_text)
+            logger.debug("  Search c3-encoding (partial): %s...", c3_encoding[:15])
+            logger.debug("  Search c3-clienttime: %s", c3_clienttime)
 
         response_obj = None
         try:
             response_obj = self.session.post(
-                search_url, headers=headers, data=payload, verify=False, timeout=timeout
+                search_url, headers=headers, data=payload, timeout=timeout
             )
             response_obj.raise_for_status()
-            data = response_obj.json()
         except requests.exceptions.HTTPError as http_err:
-            raise TflCycleHireAPIError(
-                str(http_err),
-                getattr(http_err.response, "status_code", None),
-                getattr(http_err.response, "text", None),
-            ) from http_err
+            raise _api_error_from_http_error(http_err) from http_err
         except (
             Exception
         ) as e:  # More specific request exceptions could be caught above this
             raise TflCycleHireSDKError(
                 f"Search station API call unexpected error: {e}"
             ) from e
+        try:
+            data = _json_loads(response_obj.content)
+        except ValueError as json_err:  # Covers json/orjson/ujson decode errors
+            # Only the error path ever touches response.text.
+            raise TflCycleHireAPIError(
+                "Failed to decode search JSON response.",
+                response_obj.status_code,
+                response_obj.text,
+            ) from json_err
 
         # --- Parsing logic from previous search_stations method ---
         results: List[SearchedStationInfo] = []
         children = data.get("Children", [])
         station_data_aggregator: Dict[str, Dict[str, Any]] = {}
+        match_searchresult_id = self._RE_SEARCHRESULT_ID.match
         for child in children:
-            child_type = child.get("Type")
-            child_id_str = child.get("ID", "")
-            id_match = re.match(r"^(lchs_searchresult_(\d+))", child_id_str)
+            get = child.get  # Bound once; each child is read several times below
+            id_match = match_searchresult_id(get("ID", ""))
             if not id_match:
                 continue
+            child_type = get("Type")
             station_id_prefix = id_match.group(1)
-            parsed_station_id = id_match.group(2)
-            if station_id_prefix not in station_data_aggregator:
-                station_data_aggregator[station_id_prefix] = {
-                    "raw_station_id_from_id": parsed_station_id
+            # Single lookup on the hit path; the entry dict is only built on insert.
+            current_station_entry = station_data_aggregator.get(station_id_prefix)
+            if current_station_entry is None:
+                current_station_entry = station_data_aggregator[station_id_prefix] = {
+                    "raw_station_id_from_id": id_match.group(2)
                 }
-            current_station_entry = station_data_aggregator[station_id_prefix]
             if child_type == "Node.Link":
-                current_station_entry["name"] = child.get("Name")
-                current_station_entry["subtitle"] = child.get("Subtitle")
-                tags = child.get("Tags", {})
+                current_station_entry["name"] = get("Name")
+                current_station_entry["subtitle"] = get("Subtitle")
+                tags = get("Tags") or _EMPTY_TAGS
                 current_station_entry["dock_location"] = tags.get("LCHS.DockLocation")
-                if tags.get("LCHS.StationID"):
-                    current_station_entry["station_id_from_link_tags"] = tags.get(
-                        "LCHS.StationID"
-                    )
-            elif child_type == "Node.Media.Image" and child.get("Name") == "Hire now":
-                tags = child.get("Tags", {})
+                link_station_id = tags.get("LCHS.StationID")
+                if link_station_id:
+                    current_station_entry["station_id_from_link_tags"] = link_station_id
+            elif child_type == "Node.Media.Image" and get("Name") == "Hire now":
+                tags = get("Tags") or _EMPTY_TAGS
                 current_station_entry["terminal_name_from_image_tags"] = tags.get(
                     "Terminal"
                 )
                 current_station_entry["point_name_from_image_tags"] = tags.get(
                     "PointName"
                 )
-                if tags.get("StationID"):
-                    current_station_entry["station_id_from_image_tags"] = tags.get(
-                        "StationID"
+                image_station_id = tags.get("StationID")
+                if image_station_id:
+                    current_station_entry["station_id_from_image_tags"] = (
+                        image_station_id
                     )
 
         for prefix, collected_details in station_data_aggregator.items():
@@ -530,18 +1019,20 @@ class TflCycleHireSDK:
             terminal_name = collected_details.get("terminal_name_from_image_tags")
             if station_id and name and point_name:
                 results.append(
-                    {
-                        "station_id": station_id,
-                        "name": name,
-                        "subtitle": collected_details.get("subtitle", "N/A"),
-                        "terminal_name": terminal_name,
-                        "point_name": point_name,
-                        "dock_location": collected_details.get("dock_location"),
-                    }
-                )  # type: ignore
+                    SearchedStationInfo(
+                        station_id=station_id,
+                        name=name,
+                        subtitle=collected_details.get("subtitle", "N/A"),
+                        terminal_name=terminal_name,
+                        point_name=point_name,
+                        dock_location=collected_details.get("dock_location"),
+                    )
+                )
             else:
                 logger.warning(
-                    f"Skipping search result (prefix {prefix}): missing core data: {collected_details}"
+                    "Skipping search result (prefix %s): missing core data: %s",
+                    prefix,
+                    collected_details,
                 )
         # --- End parsing logic ---
         return results
@@ -558,6 +1049,7 @@ class TflCycleHireSDK:
         try_active_fresh_time: bool = True,
         # New: allow priming from a static location if no active tokens
         prime_from_static_if_no_active: Optional[StaticallyDefinedLocationKey] = None,
+        retry_config: Optional[RetryConfig] = None,
     ) -> List[SearchedStationInfo]:
         """
         Searches for docking stations using smart token strategies or explicit overrides.
@@ -572,14 +1064,14 @@ class TflCycleHireSDK:
             try_active_fresh_time: Attempt with currently active SDK encoding and fresh time.
             prime_from_static_if_no_active: If no active SDK tokens, optionally prime them
                                             from a specified static location's data before trying.
+            retry_config: Backoff for transient errors on this call (default: the SDK's).
 
         Returns:
             A list of SearchedStationInfo dictionaries.
         Raises:
             TflCycleHireSDKError: If all attempted strategies fail or no valid strategy provided.
         """
-        logger.info(f"Smart search for stations: '{search_text}'")
-        last_error: Optional[Exception] = None
+        logger.info("Smart search for stations: '%s'", search_text)
 
         # Strategy 0: Explicit override tokens
         if c3_encoding_override and c3_clienttime_override:
@@ -595,12 +1087,13 @@ class TflCycleHireSDK:
                     f"explicit_override_for_search_{search_text}",
                 )
                 logger.info(
-                    f"Search successful with explicit tokens. Found {len(results)} stations."
+                    "Search successful with explicit tokens. Found %d stations.",
+                    len(results),
                 )
                 return results
             except Exception as e:
                 logger.error(
-                    f"Strategy (explicit override tokens for search) failed: {e}"
+                    "Strategy (explicit override tokens for search) failed: %s", e
                 )
                 # If explicit tokens fail, we don't try other strategies for this call.
                 raise TflCycleHireSDKError(
@@ -610,73 +1103,37 @@ class TflCycleHireSDK:
         # Before trying active tokens, prime them if requested and none are active
         if prime_from_static_if_no_active and not self._active_c3_encoding:
             logger.info(
-                f"No active SDK tokens. Priming from static location '{prime_from_static_if_no_active}' for search."
+                "No active SDK tokens. Priming from static location '%s' for search.",
+                prime_from_static_if_no_active,
             )
             if not self.prime_tokens_from_static_location(
                 prime_from_static_if_no_active
             ):
                 # Priming failed, this strategy path is blocked unless active tokens somehow exist
                 logger.warning(
-                    f"Failed to prime tokens from '{prime_from_static_if_no_active}'. Proceeding without priming if active tokens exist."
+                    "Failed to prime tokens from '%s'. Proceeding without priming if active tokens exist.",
+                    prime_from_static_if_no_active,
                 )
 
         # Strategy 1: Active SDK tokens with original client time
-        if (
-            try_active_original_time
-            and self._active_c3_encoding
-            and self._active_original_c3_clienttime
-        ):
-            logger.info("Strategy (Search): Trying active SDK tokens (original time).")
-            try:
-                results = self._execute_search_api_call(
-                    search_text,
-                    self._active_c3_encoding,
-                    self._active_original_c3_clienttime,
-                    timeout,
-                )
-                # Active tokens worked for search, no need to update them if they were already set.
-                logger.info(
-                    f"Search successful with active (original time) tokens. Found {len(results)} stations."
-                )
-                return results
-            except Exception as e:
-                logger.warning(
-                    f"Strategy (active original time for search) failed: {e}"
-                )
-                last_error = e
-
         # Strategy 2: Active SDK encoding with fresh client time
-        if try_active_fresh_time and self._active_c3_encoding:
-            fresh_client_time = f"{time.time():.6f}"
-            logger.info(
-                f"Strategy (Search): Trying active SDK encoding with FRESH time ({fresh_client_time})."
-            )
-            try:
-                results = self._execute_search_api_call(
-                    search_text, self._active_c3_encoding, fresh_client_time, timeout
-                )
-                # If this succeeds, update active tokens.
-                self.set_active_tokens(
-                    self._active_c3_encoding,
-                    fresh_client_time,
-                    f"active_encoding_fresh_time_for_search_{search_text}",
-                )
-                logger.info(
-                    f"Search successful with active encoding (fresh time). Found {len(results)} stations."
-                )
-                return results
-            except Exception as e:
-                logger.warning(f"Strategy (active fresh time for search) failed: {e}")
-                last_error = e
-
-        final_msg = f"All token strategies failed for search_stations with query '{search_text}'."
-        if last_error:
-            raise TflCycleHireSDKError(final_msg) from last_error
-        else:
-            raise TflCycleHireConfigError(
-                final_msg
-                + " No token strategies enabled or active/primeable tokens available."
-            )
+        plan = self._plan_active_token_strategies(
+            try_active_original_time,
+            try_active_fresh_time,
+            f"active_encoding_fresh_time_for_search_{search_text}",
+            label_suffix=" for search",
+        )
+        results = self._run_token_strategies(
+            plan,
+            lambda c3_encoding, c3_clienttime: self._execute_search_api_call(
+                search_text, c3_encoding, c3_clienttime, timeout
+            ),
+            f"All token strategies failed for search_stations with query '{search_text}'.",
+            "No token strategies enabled or active/primeable tokens available.",
+            retry_config,
+        )
+        logger.info("Search successful. Found %d stations.", len(results))
+        return results
 
     def get_release_code_for_searched_station(
         self,
@@ -688,6 +1145,8 @@ class TflCycleHireSDK:
         # Control smart strategies for this searched station
         try_active_original_time: bool = True,
         try_active_fresh_time: bool = True,
+        parallel_strategies: bool = False,
+        retry_config: Optional[RetryConfig] = None,
     ) -> str:
         """
         Gets a release code for a station object obtained from `search_stations()`.
@@ -700,6 +1159,10 @@ class TflCycleHireSDK:
             c3_clienttime_override: Explicitly provide c3_clienttime to use with override encoding.
             try_active_original_time: Attempt with currently active SDK tokens and their original time.
             try_active_fresh_time: Attempt with currently active SDK encoding and a fresh current time.
+            parallel_strategies: Send the enabled active-token strategies at once and take
+                                 the first success (may send more than one Confirm Hire request).
+            retry_config: Backoff for transient errors on this call (default: the SDK's);
+                          only its confirm_hire_statuses are retried.
 
         Returns:
             The release code string.
@@ -707,20 +1170,22 @@ class TflCycleHireSDK:
             TflCycleHireConfigError: If station_info is invalid (e.g., no TerminalName).
             TflCycleHireSDKError: If all attempted strategies fail.
         """
+        station_name = station_info["name"]
+        target_terminal_name = station_info.get("terminal_name")
         logger.info(
-            f"Attempting release code for searched station: '{station_info['name']}' (ID: {station_info['station_id']})"
+            "Attempting release code for searched station: '%s' (ID: %s)",
+            station_name,
+            station_info["station_id"],
         )
 
-        if not station_info.get("terminal_name"):
-            msg = f"Cannot get release code for '{station_info['name']}': TerminalName is missing (station likely not hirable)."
+        if not target_terminal_name:
+            msg = f"Cannot get release code for '{station_name}': TerminalName is missing (station likely not hirable)."
             logger.error(msg)
             raise TflCycleHireConfigError(msg)
 
-        target_terminal_name = station_info["terminal_name"]
         target_point_name = station_info[
             "point_name"
         ]  # Use point_name from search result
-        last_error: Optional[Exception] = None
 
         # Strategy 0: Explicit override tokens
         if c3_encoding_override and c3_clienttime_override:
@@ -743,90 +1208,59 @@ class TflCycleHireSDK:
                 self.set_active_tokens(
                     c3_encoding_override,
                     c3_clienttime_override,
-                    f"override_for_{station_info['name']}",
+                    f"override_for_{station_name}",
                 )
                 return code
             except Exception as e:
-                logger.error(f"Strategy (explicit override tokens) failed: {e}")
+                logger.error("Strategy (explicit override tokens) failed: %s", e)
                 # If explicit tokens fail, we don't try other strategies for this call.
                 raise TflCycleHireSDKError(
-                    f"Explicit token override failed for {station_info['name']}."
+                    f"Explicit token override failed for {station_name}."
                 ) from e
 
         # Strategy 1: Active SDK tokens with original client time
-        if (
-            try_active_original_time
-            and self._active_c3_encoding
-            and self._active_original_c3_clienttime
-        ):
-            logger.info(
-                "Strategy: Trying active SDK tokens (original time) for searched station."
-            )
-            try:
-                code = self._execute_confirm_hire_api_call(
-                    target_terminal_name,
-                    target_point_name,
-                    self._active_c3_encoding,
-                    self._active_original_c3_clienttime,
-                    timeout,
-                )
-                # Active tokens worked, no need to update them if they were already set.
-                return code
-            except Exception as e:
-                logger.warning(
-                    f"Strategy (active original time) for searched station failed: {e}"
-                )
-                last_error = e
-
         # Strategy 2: Active SDK encoding with fresh client time
-        if try_active_fresh_time and self._active_c3_encoding:
-            fresh_client_time = f"{time.time():.6f}"
-            logger.info(
-                f"Strategy: Trying active SDK encoding with FRESH time ({fresh_client_time}) for searched station."
-            )
-            try:
-                code = self._execute_confirm_hire_api_call(
-                    target_terminal_name,
-                    target_point_name,
-                    self._active_c3_encoding,
-                    fresh_client_time,
-                    timeout,
-                )
-                # If this succeeds, update active tokens to reflect this successful pairing for future use.
-                self.set_active_tokens(
-                    self._active_c3_encoding,
-                    fresh_client_time,
-                    f"active_encoding_fresh_time_for_searched_{station_info['name']}",
-                )
-                return code
-            except Exception as e:
-                logger.warning(
-                    f"Strategy (active fresh time) for searched station failed: {e}"
-                )
-                last_error = e
-
         # No fallback to static_location_data for a searched station,
         # as it doesn't have a corresponding static entry by default.
-
-        final_msg = f"All smart token strategies failed for searched station '{station_info['name']}'."
-        if last_error:
-            raise TflCycleHireSDKError(final_msg) from last_error
-        else:
-            # This case means no strategies were enabled or no active tokens were available
-            raise TflCycleHireConfigError(
-                final_msg + " No token strategies enabled or active tokens available."
-            )
+        plan = self._plan_active_token_strategies(
+            try_active_original_time,
+            try_active_fresh_time,
+            f"active_encoding_fresh_time_for_searched_{station_name}",
+            label_suffix=" for searched station",
+        )
+        run = (
+            self._race_token_strategies
+            if parallel_strategies
+            else self._run_token_strategies
+        )
+        return run(
+            plan,
+            lambda c3_encoding, c3_clienttime: self._execute_confirm_hire_api_call(
+                target_terminal_name,
+                target_point_name,
+                c3_encoding,
+                c3_clienttime,
+                timeout,
+            ),
+            f"All smart token strategies failed for searched station '{station_name}'.",
+            "No token strategies enabled or active tokens available.",
+            (retry_config or self.retry_config).for_confirm_hire(),
+        )
 
 
 # --- Streamlit App Code ---
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
 from typing import (
     TypedDict,
     List,
     Optional,
 )  # Ensure these are imported for SearchedStationInfo
 import os  # For file operations
+import atexit  # Flush pending favorites writes on shutdown
 import json  # For saving/loading favorites
+import tempfile  # For the persisted tokens file
+import threading  # Background favorites writer
 
 # Ensure SearchedStationInfo is defined (it should be with the SDK code)
 # If not, define it here:
@@ -840,62 +1274,240 @@ import json  # For saving/loading favorites
 
 # --- Constants for Favorites Persistence ---
 FAVORITES_FILE = "tfl_cycle_favorites.json"
+# Changes within this window of each other are written to disk once.
+FAVORITES_WRITE_DEBOUNCE_SECONDS = 0.5
+
+# --- Constants for Token Persistence ---
+# Last working tokens; new browser sessions and server restarts start from them.
+# Kept in a per-user cache dir (0700, file 0600), outside the checkout.
+TOKENS_FILE = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "tfl_cycle",
+    "tokens.json",
+)
+TOKENS_MAX_AGE_SECONDS = 23 * 3600
+TOKENS_RESTORED_SOURCE = "restored_from_tokens_file"
+
+# --- UI Templates ---
+_RELEASE_CODE_HTML = "<h2 style='text-align: center; color: green;'>{code}</h2>".format
 
 
 # --- Helper Functions for Favorites Persistence ---
 def load_favorites_from_file() -> List[SearchedStationInfo]:
     if os.path.exists(FAVORITES_FILE):
         try:
-            with open(FAVORITES_FILE, "r") as f:
-                favorites_data = json.load(f)
+            with open(FAVORITES_FILE, "rb") as f:
+                favorites_data = _json_loads(f.read())
                 # Basic validation: ensure it's a list
                 if isinstance(favorites_data, list):
-                    # Further validation could be added here to check structure of each item
-                    return favorites_data
+                    # Drop malformed entries once here so the UI can trust every item
+                    valid = [
+                        fav
+                        for fav in favorites_data
+                        if isinstance(fav, dict)
+                        and "station_id" in fav
+                        and "name" in fav
+                    ]
+                    if len(valid) != len(favorites_data):
+                        logger.warning(
+                            "Skipped %d invalid favorite item(s) in '%s'.",
+                            len(favorites_data) - len(valid),
+                            FAVORITES_FILE,
+                        )
+                    return valid
                 else:
                     logger.warning(
-                        f"Favorites file '{FAVORITES_FILE}' does not contain a list. Starting fresh."
+                        "Favorites file '%s' does not contain a list. Starting fresh.",
+                        FAVORITES_FILE,
                     )
                     return []
-        except json.JSONDecodeError:
+        except ValueError:  # Covers json/orjson/ujson decode errors
             logger.warning(
-                f"Error decoding favorites file '{FAVORITES_FILE}'. Starting fresh."
+                "Error decoding favorites file '%s'. Starting fresh.", FAVORITES_FILE
             )
             return []
         except Exception as e:
-            logger.error(f"Error loading favorites from file: {e}")
+            logger.error("Error loading favorites from file: %s", e)
             return []  # Fallback to empty list on other errors
     return []
 
 
+def _favorites_file_mtime() -> int:
+    try:
+        return os.stat(FAVORITES_FILE).st_mtime_ns
+    except OSError:
+        return 0
+
+
+# Parsed once per file version and shared by all sessions in the process; an
+# external edit changes the mtime and so misses the cache. cache_data hands each
+# caller its own copy, so sessions can mutate their list freely.
+@st.cache_data(show_spinner=False)
+def load_favorites_cached(mtime_ns: int) -> List[SearchedStationInfo]:
+    return load_favorites_from_file()
+
+
 def save_favorites_to_file(favorites_list: List[SearchedStationInfo]):
+    tmp_path = f"{FAVORITES_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            # Compact: the file is read back by the app, not edited by hand.
+            f.write(_json_dumps(favorites_list))
+        os.replace(tmp_path, FAVORITES_FILE)  # Atomic; readers never see a partial file
+        logger.info("Favorites saved to %s", FAVORITES_FILE)
+    except Exception as e:
+        logger.error("Error saving favorites to file: %s", e)
+
+
+class _FavoritesWriter:
+    """
+    Saves favorites off the script thread, coalescing bursts: only the latest
+    snapshot submitted during the debounce window is written.
+    """
+
+    def __init__(self, debounce_seconds: float):
+        self._debounce_seconds = debounce_seconds
+        self._pending: Optional[List[SearchedStationInfo]] = None
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()  # Keeps snapshots landing in order
+        self._dirty = threading.Event()
+        threading.Thread(target=self._run, name="favorites-writer", daemon=True).start()
+        atexit.register(self.flush)
+
+    def submit(self, favorites_list: List[SearchedStationInfo]) -> None:
+        # Snapshot the list; the session keeps mutating its own copy.
+        with self._pending_lock:
+            self._pending = list(favorites_list)
+        self._dirty.set()
+
+    def flush(self) -> None:
+        with self._write_lock:
+            with self._pending_lock:
+                pending, self._pending = self._pending, None
+                self._dirty.clear()
+            if pending is not None:
+                save_favorites_to_file(pending)
+
+    def _run(self) -> None:
+        while True:
+            self._dirty.wait()
+            time.sleep(self._debounce_seconds)
+            self.flush()
+
+
+@st.cache_resource
+def _favorites_writer() -> _FavoritesWriter:
+    # One writer per server process, shared by all sessions.
+    return _FavoritesWriter(FAVORITES_WRITE_DEBOUNCE_SECONDS)
+
+
+def save_favorites_in_background(favorites_list: List[SearchedStationInfo]):
+    _favorites_writer().submit(favorites_list)
+
+
+# --- Helper Functions for Token Persistence ---
+def load_persisted_tokens() -> Optional[Dict[str, Any]]:
+    try:
+        with open(TOKENS_FILE, "rb") as f:
+            tokens = _json_loads(f.read())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Ignoring unreadable tokens file '%s': %s", TOKENS_FILE, e)
+        return None
+    if not isinstance(tokens, dict) or not all(
+        isinstance(tokens.get(k), str) for k in ("c3_encoding", "c3_clienttime")
+    ):
+        return None
+    if time.time() - tokens.get("primed_at", 0) >= TOKENS_MAX_AGE_SECONDS:
+        return None
+    return tokens
+
+
+def persist_tokens(c3_encoding: str, c3_clienttime: str, source_info: str):
+    if source_info == TOKENS_RESTORED_SOURCE:
+        return  # Already on disk; keep the original primed_at
+    tokens = {
+        "c3_encoding": c3_encoding,
+        "c3_clienttime": c3_clienttime,
+        "source": source_info,
+        "primed_at": time.time(),
+    }
+    tmp_path = None
     try:
-        with open(FAVORITES_FILE, "w") as f:
-            json.dump(favorites_list, f, indent=2)
-        logger.info(f"Favorites saved to {FAVORITES_FILE}")
+        tokens_dir = os.path.dirname(TOKENS_FILE)
+        os.makedirs(tokens_dir, mode=0o700, exist_ok=True)
+        # mkstemp creates the file 0600, so the encoding is never world-readable.
+        fd, tmp_path = tempfile.mkstemp(prefix="tokens.", suffix=".tmp", dir=tokens_dir)
+        with os.fdopen(fd, "wb") as f:
+            f.write(_json_dumps(tokens))
+        os.replace(tmp_path, TOKENS_FILE)  # Atomic; readers never see a partial file
     except Exception as e:
-        logger.error(f"Error saving favorites to file: {e}")
+        logger.error("Error saving tokens to file: %s", e)
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
 
 # --- SDK Initialization and State Management ---
-def get_sdk():
-    if "sdk" not in st.session_state:
-        # Configure logging for the SDK and app
+@st.cache_resource
+def _configure_logging() -> None:
+    # Once per server process, and only if the host has not configured logging.
+    if not logging.getLogger().handlers:
         logging.basicConfig(
             level=logging.INFO,  # Or logging.DEBUG for more SDK output
             format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         )
-        st.session_state.sdk = TflCycleHireSDK()
-        if not st.session_state.sdk._active_c3_encoding:
-            st.session_state.sdk.prime_tokens_from_static_location(
-                "cromer_street"
-            )  # Default priming
+
+
+@st.cache_resource
+def _shared_http_session() -> requests.Session:
+    # One connection pool per server process, shared by all browser sessions.
+    return TflCycleHireSDK.build_session()
+
+
+def _build_sdk() -> TflCycleHireSDK:
+    # Tokens and the auth-failure map stay per browser session; only the
+    # connection pool is shared.
+    sdk = TflCycleHireSDK(
+        session=_shared_http_session(), on_tokens_changed=persist_tokens
+    )
+    tokens = load_persisted_tokens()
+    if tokens:
+        sdk.set_active_tokens(
+            tokens["c3_encoding"], tokens["c3_clienttime"], TOKENS_RESTORED_SOURCE
+        )
+    else:
+        sdk.prime_tokens_from_static_location("cromer_street")  # Default priming
+    return sdk
+
+
+def get_sdk():
+    _configure_logging()
+    if "sdk" not in st.session_state:
+        st.session_state.sdk = _build_sdk()
     return st.session_state.sdk
 
 
+# Identical searches within a few minutes are served from Streamlit's data cache.
+# Failed searches raise, and exceptions are never cached.
+@st.cache_data(ttl=300, show_spinner=False)
+def cached_search_stations(
+    normalized_query: str,
+    prime_key: StaticallyDefinedLocationKey,
+    _search_text: str,
+    _sdk: TflCycleHireSDK,
+) -> List[SearchedStationInfo]:
+    # normalized_query is only the cache key; the leading underscore keeps
+    # Streamlit from hashing the raw text and the SDK instance.
+    return _sdk.search_stations(_search_text, prime_from_static_if_no_active=prime_key)
+
+
 # Initialize session state variables
 if "search_results" not in st.session_state:
     st.session_state.search_results = []
+if "hirable_search_results" not in st.session_state:
+    # Derived from search_results; only recomputed when a search completes.
+    st.session_state.hirable_search_results = []
 if "selected_station_info_for_code" not in st.session_state:
     st.session_state.selected_station_info_for_code = None
 if "release_code" not in st.session_state:
@@ -903,7 +1515,12 @@ if "release_code" not in st.session_state:
 if "error_message" not in st.session_state:
     st.session_state.error_message = None
 if "favorites" not in st.session_state:  # Load favorites from file on first run
-    st.session_state.favorites = load_favorites_from_file()
+    st.session_state.favorites = load_favorites_cached(_favorites_file_mtime())
+if "favorite_ids" not in st.session_state:
+    # Membership index for favorites; kept in step by add/remove below.
+    st.session_state.favorite_ids = {
+        fav["station_id"] for fav in st.session_state.favorites
+    }
 
 
 # --- App UI ---
@@ -913,17 +1530,20 @@ st.title("🚲 TfL Cycle Hire Code")
 sdk_instance = get_sdk()  # Ensures SDK is initialized and logger is configured
 
 
+ss = st.session_state  # Local alias for the rest of the script
+
+
 # --- Helper Functions for Favorites (Interacting with State and File) ---
 def add_to_favorites(station_info: SearchedStationInfo):
-    if not any(
-        fav["station_id"] == station_info["station_id"]
-        for fav in st.session_state.favorites
-    ):
+    favorite_ids = ss.favorite_ids
+    if station_info["station_id"] not in favorite_ids:
         if station_info.get("terminal_name"):
-            st.session_state.favorites.append(station_info)
-            save_favorites_to_file(st.session_state.favorites)  # Save after adding
+            favorites = ss.favorites
+            favorites.append(station_info)
+            favorite_ids.add(station_info["station_id"])
+            save_favorites_in_background(favorites)
             st.success(f"Added '{station_info['name']}' to favorites!")
-            st.session_state.error_message = None
+            ss.error_message = None
         else:
             st.warning(
                 f"Cannot add '{station_info['name']}' to favorites: Not currently hirable."
@@ -933,80 +1553,128 @@ def add_to_favorites(station_info: SearchedStationInfo):
 
 
 def remove_from_favorites(station_id: str):
-    # Find the name before removing for the success message
-    station_name_to_remove = "Station"
-    for fav in st.session_state.favorites:
-        if fav["station_id"] == station_id:
-            station_name_to_remove = fav["name"]
-            break
-
-    st.session_state.favorites = [
-        fav for fav in st.session_state.favorites if fav["station_id"] != station_id
-    ]
-    save_favorites_to_file(st.session_state.favorites)  # Save after removing
+    # Find the entry once; its name is needed for the success message
+    favorites = ss.favorites
+    fav = next((f for f in favorites if f["station_id"] == station_id), None)
+    station_name_to_remove = fav["name"] if fav else "Station"
+    if fav is not None:
+        favorites.remove(fav)
+    ss.favorite_ids.discard(station_id)
+    save_favorites_in_background(favorites)
     st.success(f"Removed '{station_name_to_remove}' from favorites.")
-    st.session_state.error_message = None
-    if (
-        st.session_state.selected_station_info_for_code
-        and st.session_state.selected_station_info_for_code["station_id"] == station_id
-    ):
-        st.session_state.release_code = None
-        st.session_state.selected_station_info_for_code = None
+    ss.error_message = None
+    selected = ss.selected_station_info_for_code
+    if selected and selected["station_id"] == station_id:
+        ss.release_code = None
+        ss.selected_station_info_for_code = None
 
 
 def handle_get_code_for_favorite(fav_station_info: SearchedStationInfo):
-    st.session_state.release_code = None  # Clear previous code display
-    st.session_state.selected_station_info_for_code = (
-        None  # Clear selected station for code display
-    )
-    st.session_state.error_message = None
+    ss.release_code = None  # Clear previous code display
+    ss.selected_station_info_for_code = None  # Clear selected station for code display
+    ss.error_message = None
     with st.spinner(f"Getting code for favorite: {fav_station_info['name']}..."):
         try:
             code = sdk_instance.get_release_code_for_searched_station(fav_station_info)
-            st.session_state.release_code = code
-            st.session_state.selected_station_info_for_code = fav_station_info
+            ss.release_code = code
+            ss.selected_station_info_for_code = fav_station_info
         except TflCycleHireSDKError as e:
-            st.session_state.error_message = (
+            ss.error_message = (
                 f"Error getting code for favorite '{fav_station_info['name']}': {e}"
             )
         except Exception as e:
-            st.session_state.error_message = f"An unexpected error occurred: {e}"
+            ss.error_message = f"An unexpected error occurred: {e}"
+            # Traceback only when DEBUG is on; debug() returns early otherwise.
+            logger.debug("Unexpected error getting favorite code", exc_info=True)
+
+
+def _stations_table(
+    stations: List[SearchedStationInfo], favorite_ids: Optional[Set[str]] = None
+) -> Dict[str, List[str]]:
+    table = {
+        "Station": [s.get("name", "Unknown Station") for s in stations],
+        "Availability": [s.get("subtitle", "N/A") for s in stations],
+    }
+    if favorite_ids is not None:
+        table["Fav"] = [
+            "✔️" if s["station_id"] in favorite_ids else "" for s in stations
+        ]
+    return table
+
+
+def _selected_row(
+    stations: List[SearchedStationInfo], event: Any
+) -> Optional[SearchedStationInfo]:
+    rows = event.selection.rows
+    # The selection survives reruns by position, so it may point past a shrunk list.
+    if rows and rows[0] < len(stations):
+        return stations[rows[0]]
+    return None
+
+
+# Streamlit >= 1.37 has st.fragment; older releases only the experimental name.
+_fragment = (
+    getattr(st, "fragment", None)
+    or getattr(st, "experimental_fragment", None)
+    or (lambda func: func)
+)
+
+
+def _rerun_fragment():
+    # Reruns just the calling fragment. Falls back to a full rerun on releases
+    # without fragment-scoped reruns, or when the fragment is running as part
+    # of a full script run.
+    try:
+        st.rerun(scope="fragment")
+    except (TypeError, StreamlitAPIException):
+        st.rerun()
 
 
 # --- 1. Favorites Section ---
-if st.session_state.favorites:
+# A fragment: selecting or removing a favorite reruns only this section.
+@_fragment
+def render_favorites():
+    favorites_to_display = ss.favorites  # Validated on load
+    if not favorites_to_display:
+        st.markdown("---")
+        st.info(
+            "No favorite stations yet. Search for stations and click '⭐' to add them here for quick access!"
+        )
+        return
+
     st.markdown("---")
     st.subheader("⭐ Your Favorite Stations")
-    # Create a copy for iteration if removing items might cause issues, though st.rerun helps
-    favorites_to_display = list(st.session_state.favorites)
-    for fav_station in favorites_to_display:
-        # Ensure fav_station is a dictionary and has 'station_id'
-        if not isinstance(fav_station, dict) or "station_id" not in fav_station:
-            logger.warning(f"Skipping invalid favorite item: {fav_station}")
-            continue
-
-        col1, col2, col3 = st.columns([0.6, 0.25, 0.15])
-        with col1:
-            st.write(
-                f"**{fav_station.get('name', 'Unknown Station')}** ({fav_station.get('subtitle', 'N/A')})"
-            )
-        with col2:
-            if st.button("Get Code", key=f"fav_getcode_{fav_station['station_id']}"):
-                handle_get_code_for_favorite(fav_station)
-        with col3:
-            if st.button(
-                "✖️",
-                key=f"fav_remove_{fav_station['station_id']}",
-                help="Remove from favorites",
-            ):
-                remove_from_favorites(fav_station["station_id"])
-                st.rerun()  # Rerun to update the favorites list display immediately
-    # st.caption("Favorites are saved locally in 'tfl_cycle_favorites.json'.") # Removed this as it's an implementation detail the user might not need
-else:  # No favorites yet
-    st.markdown("---")
-    st.info(
-        "No favorite stations yet. Search for stations and click '⭐' to add them here for quick access!"
+
+    # One table widget for all rows instead of a row of columns and buttons per
+    # favorite; the buttons below act on the selected row.
+    selected_fav = _selected_row(
+        favorites_to_display,
+        st.dataframe(
+            _stations_table(favorites_to_display),
+            hide_index=True,
+            on_select="rerun",
+            selection_mode="single-row",
+            key="fav_table",
+        ),
     )
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Get Code", key="fav_getcode", disabled=selected_fav is None):
+            handle_get_code_for_favorite(selected_fav)
+            st.rerun()  # The code and any error render outside this fragment
+    with col2:
+        if st.button(
+            "✖️ Remove",
+            key="fav_remove",
+            disabled=selected_fav is None,
+            help="Remove the selected station from favorites",
+        ):
+            remove_from_favorites(selected_fav["station_id"])
+            _rerun_fragment()  # Update the favorites list display immediately
+    # st.caption("Favorites are saved locally in 'tfl_cycle_favorites.json'.") # Removed this as it's an implementation detail the user might not need
+
+
+render_favorites()
 
 
 # --- 2. Search for Stations ---
@@ -1017,117 +1685,122 @@ search_query = st.text_input(
 )
 
 if st.button("Search Stations", key="search_button"):
-    st.session_state.search_results = []
-    st.session_state.error_message = None
+    ss.search_results = []
+    ss.hirable_search_results = []
+    ss.error_message = None
 
     if search_query:
         with st.spinner(f"Searching for '{search_query}'..."):
             try:
-                results = sdk_instance.search_stations(
-                    search_query, prime_from_static_if_no_active="cromer_street"
+                search_text = search_query.strip()
+                results = cached_search_stations(
+                    search_text.casefold(), "cromer_street", search_text, sdk_instance
                 )
-                st.session_state.search_results = results
+                ss.search_results = results
+                ss.hirable_search_results = [
+                    s for s in results if s.get("terminal_name")
+                ]
                 if not results:
                     st.info("No stations found for your search.")
             except TflCycleHireSDKError as e:
-                st.session_state.error_message = f"Search Error: {e}"
+                ss.error_message = f"Search Error: {e}"
             except Exception as e:
-                st.session_state.error_message = (
-                    f"An unexpected error occurred during search: {e}"
-                )
+                ss.error_message = f"An unexpected error occurred during search: {e}"
+                logger.debug("Unexpected error during search", exc_info=True)
     else:
         st.warning("Please enter a search term.")
 
-
-# --- Display Error Messages (centralized) ---
-if st.session_state.error_message:
-    st.error(st.session_state.error_message)
-    # Clear error after displaying to prevent it from showing up on next interaction if not relevant
-    st.session_state.error_message = None
-
-# --- 3. Select Station from Search and Get Code ---
-# ... (This section remains the same, including the "⭐ Add Fav" button logic) ...
-if st.session_state.search_results:
-    st.markdown("---")
-    st.subheader("Search Results:")
-
-    hirable_stations_from_search = [
-        s for s in st.session_state.search_results if s.get("terminal_name")
-    ]
-
-    if not hirable_stations_from_search:
-        st.info(
-            "No stations with current bike availability (hirable) found in search results."
-        )
-        if st.session_state.search_results:
-            st.caption("Other stations found (not currently hirable):")
-            for s_non_hirable in st.session_state.search_results:
-                if not s_non_hirable.get("terminal_name"):
-                    st.write(
-                        f"- {s_non_hirable['name']} ({s_non_hirable.get('subtitle', 'N/A')})"
-                    )
-    else:
-        for station_info in hirable_stations_from_search:
-            if not isinstance(station_info, dict) or "station_id" not in station_info:
-                logger.warning(f"Skipping invalid search result item: {station_info}")
-                continue
-            key_prefix = f"search_{station_info['station_id']}"
-            is_favorite = any(
-                fav["station_id"] == station_info["station_id"]
-                for fav in st.session_state.favorites
+if st.button(
+    "Clear cache",
+    key="clear_search_cache",
+    help="Forget cached search results so the next search asks the API again.",
+):
+    cached_search_stations.clear()
+
+
+# Errors, search results and the release code form one fragment: a "Get Code"
+# click reruns only this part of the page, not favorites and the search box.
+@_fragment
+def render_results_and_code():
+    # --- Display Error Messages (centralized) ---
+    if ss.error_message:
+        st.error(ss.error_message)
+        # Clear error after displaying to prevent it from showing up on next interaction if not relevant
+        ss.error_message = None
+
+    # --- 3. Select Station from Search and Get Code ---
+    # ... (This section remains the same, including the "⭐ Add Fav" button logic) ...
+    if ss.search_results:
+        st.markdown("---")
+        st.subheader("Search Results:")
+
+        hirable_stations_from_search = ss.hirable_search_results
+
+        if not hirable_stations_from_search:
+            st.info(
+                "No stations with current bike availability (hirable) found in search results."
             )
-
-            col_name, col_subtitle, col_action1, col_action2 = st.columns(
-                [0.4, 0.3, 0.15, 0.15]
+            if ss.search_results:
+                st.caption("Other stations found (not currently hirable):")
+                for s_non_hirable in ss.search_results:
+                    if not s_non_hirable.get("terminal_name"):
+                        st.write(
+                            f"- {s_non_hirable['name']} ({s_non_hirable.get('subtitle', 'N/A')})"
+                        )
+        else:
+            # The SDK only returns well-formed results, so no per-item checks.
+            favorite_ids = ss.favorite_ids
+            station_info = _selected_row(
+                hirable_stations_from_search,
+                st.dataframe(
+                    _stations_table(hirable_stations_from_search, favorite_ids),
+                    hide_index=True,
+                    on_select="rerun",
+                    selection_mode="single-row",
+                    key="search_table",
+                ),
             )
-            with col_name:
-                st.write(f"**{station_info.get('name', 'Unknown')}**")
-            with col_subtitle:
-                st.caption(f"{station_info.get('subtitle', 'N/A')}")
+            col_action1, col_action2 = st.columns(2)
             with col_action1:
-                if st.button("Get Code", key=f"{key_prefix}_getcode"):
-                    st.session_state.release_code = None
-                    st.session_state.selected_station_info_for_code = None
-                    st.session_state.error_message = None
+                if st.button(
+                    "Get Code", key="search_getcode", disabled=station_info is None
+                ):
+                    ss.release_code = None
+                    ss.selected_station_info_for_code = None
+                    ss.error_message = None
                     with st.spinner(f"Getting code for {station_info['name']}..."):
                         try:
                             code = sdk_instance.get_release_code_for_searched_station(
                                 station_info
                             )
-                            st.session_state.release_code = code
-                            st.session_state.selected_station_info_for_code = (
-                                station_info
-                            )
+                            ss.release_code = code
+                            ss.selected_station_info_for_code = station_info
                         except TflCycleHireSDKError as e:
-                            st.session_state.error_message = f"Error getting code: {e}"
+                            ss.error_message = f"Error getting code: {e}"
                         except Exception as e:
-                            st.session_state.error_message = (
-                                f"An unexpected error occurred: {e}"
-                            )
+                            ss.error_message = f"An unexpected error occurred: {e}"
+                            logger.debug("Unexpected error getting code", exc_info=True)
             with col_action2:
-                if not is_favorite:
-                    if st.button(
-                        "⭐",
-                        key=f"{key_prefix}_addfav",
-                        help="Add to favorites",
-                    ):
-                        add_to_favorites(station_info)
-                        st.rerun()
-                else:
-                    st.caption("✔️ Fav")
-
-
-# --- 4. Display Release Code ---
-# ... (This section remains the same) ...
-if st.session_state.release_code and st.session_state.selected_station_info_for_code:
-    st.markdown("---")
-    station_name_for_display = st.session_state.selected_station_info_for_code["name"]
-    st.subheader(f"✅ Release Code for {station_name_for_display}:")
-    st.markdown(
-        f"<h2 style='text-align: center; color: green;'>{st.session_state.release_code}</h2>",
-        unsafe_allow_html=True,
-    )
-    st.info("This code is likely valid for a limited time (e.g., 10 minutes).")
+                if st.button(
+                    "⭐ Add to favorites",
+                    key="search_addfav",
+                    disabled=station_info is None
+                    or station_info["station_id"] in favorite_ids,
+                ):
+                    add_to_favorites(station_info)
+                    st.rerun()
+
+    # --- 4. Display Release Code ---
+    # ... (This section remains the same) ...
+    if ss.release_code and ss.selected_station_info_for_code:
+        st.markdown("---")
+        station_name_for_display = ss.selected_station_info_for_code["name"]
+        st.subheader(f"✅ Release Code for {station_name_for_display}:")
+        st.markdown(_RELEASE_CODE_HTML(code=ss.release_code), unsafe_allow_html=True)
+        st.info("This code is likely valid for a limited time (e.g., 10 minutes).")
+
+
+render_results_and_code()
 
 
 st.markdown("---")
@@ -5,6 +5,14 @@ import re
 import urllib3
 import time
 import logging
+import functools
+import threading
+import urllib.parse
+from collections import OrderedDict
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import (
     Literal,
     Dict,
@@ -15,8 +23,24 @@ from typing import (
     Mapping,
     List,
     TypedDict,
+    Callable,
+    TypeVar,
 )  # Added TypedDict
 
+# --- Optional fast JSON decoder (falls back to the stdlib) ---
+# All of these accept the raw response bytes, so we never materialize response.text.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+
+        _json_loads = ujson.loads
+    except ImportError:
+        _json_loads = json.loads
+
 
 # --- SDK Specific Exceptions (Copy from your SDK file) ---
 class TflCycleHireSDKError(Exception):
@@ -51,6 +75,44 @@ sdk_logger = logging.getLogger(
 )  # Assuming your SDK uses a logger named like this or its module name
 sdk_logger.setLevel(logging.INFO)  # Or DEBUG
 
+# Compiled once; used inside the per-child response parsing loop.
+_RELEASE_CODE_RE = re.compile(r"Release code (\d+)")
+# Search result child IDs look like "lchs_searchresult_<digits>[suffix]".
+_SEARCH_RESULT_ID_PREFIX = "lchs_searchresult_"
+
+# Request bodies are pre-encoded bytes, so requests does not set this itself.
+_FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+
+# Shared read-only stand-in for a missing "Tags" mapping while parsing responses.
+_EMPTY_TAGS: Mapping[str, Any] = MappingProxyType({})
+
+# --- SSL Warnings ---
+# urllib3.disable_warnings() mutates the global warnings filter list; only do it
+# once per process rather than on every SDK instantiation.
+_ssl_warnings_disabled = False
+
+
+def _ensure_ssl_warnings_disabled() -> None:
+    global _ssl_warnings_disabled
+    if not _ssl_warnings_disabled:
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        _ssl_warnings_disabled = True
+
+
+def _fresh_client_time() -> str:
+    """Current time as the c3-clienttime string ("<seconds>.<microseconds>")."""
+    ns = time.time_ns()
+    return f"{ns // 1_000_000_000}.{ns // 1_000 % 1_000_000:06d}"
+
+
+def _client_time_age(c3_clienttime: str) -> Optional[float]:
+    """Seconds elapsed since a c3-clienttime string; None if unparseable."""
+    try:
+        return time.time() - float(c3_clienttime)
+    except ValueError:
+        return None
+
+
 # --- TypedDicts (Copy from your SDK file) ---
 StaticallyDefinedLocationKey = Literal[
     "cromer_street", "taviton_street", "warren_street_station"
@@ -91,14 +153,191 @@ DEFAULT_LOCATION_DATA: Dict[StaticallyDefinedLocationKey, Dict[str, str]] = {
 }
 
 
+# --- Response parsing (pure functions on decoded JSON, no requests coupling) ---
+def _parse_release_code(data: Dict[str, Any]) -> Optional[str]:
+    """Extracts the release code from a decoded Confirm Hire response, if any."""
+    # Single pass: the labelled code wins; the first unlockbar code found
+    # along the way is kept as a fallback.
+    release_code_found: Optional[str] = None
+    unlockbar_code: Optional[str] = None
+    for child in data.get("Children") or ():
+        get = child.get
+        name = get("Name")
+        if name == "Your cycle hire release code:" and "Subtitle" in child:
+            release_code_found = get("Subtitle")
+            if release_code_found:
+                break
+        elif unlockbar_code is None and name and get("ID", "").endswith("_unlockbar"):
+            match = _RELEASE_CODE_RE.search(name)
+            if match:
+                unlockbar_code = match.group(1)
+    return release_code_found or unlockbar_code
+
+
+class _StationAgg:
+    """Fields collected for one search result across its Link and Image children."""
+
+    __slots__ = (
+        "raw_id",
+        "name",
+        "subtitle",
+        "dock_location",
+        "station_id_link",
+        "station_id_image",
+        "terminal_name_image",
+        "point_name_image",
+    )
+
+    def __init__(self, raw_id: str):
+        self.raw_id = raw_id
+        self.name: Optional[str] = None
+        self.subtitle: Optional[str] = None
+        self.dock_location: Optional[str] = None
+        self.station_id_link: Optional[str] = None
+        self.station_id_image: Optional[str] = None
+        self.terminal_name_image: Optional[str] = None
+        self.point_name_image: Optional[str] = None
+
+
+def _parse_search_response(data: Dict[str, Any]) -> List[SearchedStationInfo]:
+    """Builds SearchedStationInfo entries from a decoded search response."""
+    station_data_aggregator: Dict[str, _StationAgg] = {}
+    prefix_len = len(_SEARCH_RESULT_ID_PREFIX)
+    for child in data.get("Children") or ():
+        get = child.get  # Bound once; each child is read several times below
+        child_id = get("ID", "")
+        # Plain string checks instead of a regex: most children are not results.
+        if not child_id.startswith(_SEARCH_RESULT_ID_PREFIX):
+            continue
+        id_end = prefix_len
+        while id_end < len(child_id) and child_id[id_end].isdecimal():
+            id_end += 1
+        if id_end == prefix_len:
+            continue
+        child_type = get("Type")
+        station_id_prefix = child_id[:id_end]
+        agg = station_data_aggregator.get(station_id_prefix)
+        if agg is None:
+            agg = station_data_aggregator[station_id_prefix] = _StationAgg(
+                child_id[prefix_len:id_end]
+            )
+        if child_type == "Node.Link":
+            agg.name = get("Name")
+            agg.subtitle = get("Subtitle")
+            tag = (get("Tags") or _EMPTY_TAGS).get
+            agg.dock_location = tag("LCHS.DockLocation")
+            agg.station_id_link = tag("LCHS.StationID") or agg.station_id_link
+        elif child_type == "Node.Media.Image" and get("Name") == "Hire now":
+            tag = (get("Tags") or _EMPTY_TAGS).get
+            agg.terminal_name_image = tag("Terminal")
+            agg.point_name_image = tag("PointName")
+            agg.station_id_image = tag("StationID") or agg.station_id_image
+
+    results: List[SearchedStationInfo] = []
+    for prefix, agg in station_data_aggregator.items():
+        station_id = agg.station_id_image or agg.station_id_link or agg.raw_id
+        name = agg.name
+        point_name = agg.point_name_image or name
+        if station_id and name and point_name:
+            results.append(
+                {
+                    "station_id": station_id,
+                    "name": name,
+                    "subtitle": agg.subtitle,  # type: ignore[typeddict-item]
+                    "terminal_name": agg.terminal_name_image,
+                    "point_name": point_name,
+                    "dock_location": agg.dock_location,
+                }
+            )
+        else:
+            sdk_logger.warning(
+                "Skipping search result (prefix %s): missing core data (name=%r, point_name=%r).",
+                prefix,
+                name,
+                point_name,
+            )
+    return results
+
+
+class _TTLCache:
+    """Small thread-safe LRU cache whose entries also expire after ttl seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# (label, c3_encoding, c3_clienttime or None for a fresh time taken when the
+# attempt is made, source_info to record on success or None)
+_TokenStrategy = Tuple[str, str, Optional[str], Optional[str]]
+_T = TypeVar("_T")
+
+
 # --- TflCycleHireSDK Class (Paste your entire SDK class definition here) ---
 # For brevity, I'm assuming it's defined above or in an importable module.
 # Ensure it's the LATEST version that includes search_stations with smart token handling.
 class TflCycleHireSDK:
+    # Fixed instance layout; class-level constants below are unaffected.
+    __slots__ = (
+        "_c3_userauth",
+        "config",
+        "_applied_config",
+        "static_location_data",
+        "static_location_keys",
+        "session",
+        "_owns_session",
+        "_confirm_hire_body_prefix",
+        "_search_body_prefix",
+        "_active_c3_encoding",
+        "_active_original_c3_clienttime",
+        "_active_token_source_info",
+        "_search_cache",
+    )
+
     BASE_URL_WORKFLOWS = (
         "https://ce-a22.corethree.net/Workflows/HandleEventWithNode?format=json"
     )
     BASE_URL_CLIENTS_TFL = "https://ce-a22.corethree.net/Clients/TfL"  # For search
+    API_HOST = "ce-a22.corethree.net"
+
+    # Connection pool for the single Core3 host; keeps TLS connections warm
+    # across the strategy fallbacks instead of re-handshaking per request.
+    POOL_CONNECTIONS = 16
+    POOL_MAXSIZE = 32
+
+    # Requests use (connect, read) timeouts so a dead host fails fast; the
+    # per-call `timeout` arguments below are the read timeout.
+    CONNECT_TIMEOUT = 3.0
+
+    # Search results are a slowly changing station catalog; repeated queries
+    # are served from memory for search_cache_ttl seconds (0 disables).
+    SEARCH_CACHE_MAXSIZE = 128
 
     DEFAULT_CONFIG = {
         "user_agent": "Core/202503171232 (iOS; iPad14,1; iPadOS 18.3.2; uk.gov.tfl.cyclehire)",
@@ -113,6 +352,10 @@ class TflCycleHireSDK:
         "c3_deviceid": "555D91A6-5B1E-49BC-9624-1989B4DA4833",
         "event_name": "Click",
         "c3_controlvals": "cHTnp0wCbVOhbs12x8sR4+2I/8CVACvEd8Zn5e3Tpas=",
+        "verify_ssl": False,  # Core3 host presents a cert that fails default CA checks
+        "search_cache_ttl": 60.0,
+        # Older active client times skip straight to a fresh time (None: never).
+        "active_token_ttl": 300.0,
     }
     DEFAULT_C3_USERAUTH = "564e7ff6ebbf80c4cafb4c7b7d3ea7bbc4435ad0|bcSxLxDWpaTC"
 
@@ -138,6 +381,10 @@ class TflCycleHireSDK:
 <Tag key%3D"Style.Cell.FontName">NJFont-Medium<%2FTag>
 <%2FTags>
 <%2FNode>"""
+    # Split once around its two slots so rendering is a plain join, not a format parse.
+    _NODE_XML_HEAD, _rest = NODE_XML_TEMPLATE_CONFIRM_HIRE.split("{terminal_name}", 1)
+    _NODE_XML_MID, _NODE_XML_TAIL = _rest.split("{point_name_encoded}", 1)
+    del _rest
 
     def __init__(
         self,
@@ -149,26 +396,145 @@ class TflCycleHireSDK:
         disable_ssl_warnings: bool = True,
         session: Optional[requests.Session] = None,
     ):
-        self.c3_userauth = c3_userauth
         self.config = {**self.DEFAULT_CONFIG, **(sdk_config or {})}
+        self.c3_userauth = c3_userauth
         self.static_location_data = dict(
             static_location_data_map or DEFAULT_LOCATION_DATA
         )
+        # Fixed for the SDK's lifetime; the UI's selectboxes reuse it every rerun.
+        self.static_location_keys: Tuple[str, ...] = tuple(self.static_location_data)
 
         if disable_ssl_warnings:
-            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+            _ensure_ssl_warnings_disabled()
 
-        self.session = session or requests.Session()
-        self.session.headers["User-Agent"] = self.config["user_agent"]
+        # A session passed in (e.g. the app's shared pool) is left open by close().
+        self._owns_session = session is None
+        self.session = session if session is not None else self.build_session()
 
         self._active_c3_encoding: Optional[str] = None
         self._active_original_c3_clienttime: Optional[str] = None
         self._active_token_source_info: Optional[str] = None
+        # Keyed on the lower-cased search text. Release codes are never cached:
+        # each Confirm Hire response is for a single hire.
+        self._search_cache = _TTLCache(
+            self.SEARCH_CACHE_MAXSIZE, float(self.config["search_cache_ttl"])
+        )
+        self._apply_config()  # Session headers and the static form-body prefixes
 
         sdk_logger.info(
-            f"SDK initialized. UserAuth (partial): {self.c3_userauth[:10]}..."
+            "SDK initialized. UserAuth (partial): %s...", self.c3_userauth[:10]
         )  # Use sdk_logger
 
+    @classmethod
+    def build_session(cls) -> requests.Session:
+        """
+        A requests.Session with the SDK's pooled, retrying HTTPAdapter mounted;
+        used when no session is passed in. Build one yourself to share a
+        connection pool between several SDK instances.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=cls.POOL_CONNECTIONS,
+            pool_maxsize=cls.POOL_MAXSIZE,
+            # Connect errors only: the request never left, so even a Confirm
+            # Hire POST is safe to resend. After a read timeout or a gateway
+            # error the hire may already have gone through.
+            max_retries=Retry(
+                total=2, connect=2, read=0, status=0, other=0, backoff_factor=0.2
+            ),
+        )
+        session.mount("https://", adapter)
+        return session
+
+    def close(self) -> None:
+        """Closes the HTTP session if the SDK created it; a shared one is left open."""
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self) -> "TflCycleHireSDK":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def update_config(self, **changes: Any) -> None:
+        """Changes config values and applies them right away."""
+        self.config.update(changes)
+        self._apply_config()
+
+    def _ensure_config_applied(self) -> None:
+        # config is a plain dict callers may edit in place; one comparison per
+        # request picks such edits up before anything derived from it is sent.
+        if self._applied_config != self.config:
+            self._apply_config()
+
+    def _apply_config(self) -> None:
+        """
+        Rebuilds what is derived from the config: the session headers, the
+        static form-body prefixes and, if its ttl changed, the search cache.
+        """
+        self.session.verify = self.config["verify_ssl"]
+        # Static headers live on the session; only c3-encoding varies per call.
+        self.session.headers.update(
+            {
+                "User-Agent": self.config["user_agent"],
+                "Host": self.API_HOST,
+                "Accept": "*/*",
+                "Accept-Language": self.config["accept_language"],
+            }
+        )
+        self._build_body_prefixes()
+        ttl = float(self.config["search_cache_ttl"])
+        if ttl != self._search_cache.ttl:
+            self._search_cache = _TTLCache(self.SEARCH_CACHE_MAXSIZE, ttl)
+        self._applied_config = dict(self.config)
+
+    @property
+    def c3_userauth(self) -> str:
+        return self._c3_userauth
+
+    @c3_userauth.setter
+    def c3_userauth(self, value: str) -> None:
+        self._c3_userauth = value
+        self._applied_config = None  # Rebuild the body prefixes on the next call
+
+    def _build_body_prefixes(self) -> None:
+        """
+        Urlencodes the form fields that only change with the config or
+        c3_userauth; each request only encodes and appends the fields that vary.
+        """
+        self._confirm_hire_body_prefix = urllib.parse.urlencode(
+            {
+                "c3-language": self.config["c3_language"],
+                "c3-applysensitivedatacheck": self.config["c3_applysensitivedatacheck"],
+                "c3-scalefactor": self.config["c3_scalefactor"],
+                "c3-capabilities": self.config["c3_capabilities"],
+                "c3-batterylevel": self.config["c3_batterylevel"],
+                "c3-userlat": self.config["c3_userlat"],
+                "c3-deviceid": self.config["c3_deviceid"],
+                "c3-userlong": self.config["c3_userlong"],
+                "Event": self.config["event_name"],
+                "c3-controlvals": self.config["c3_controlvals"],
+                "c3-userauth": self.c3_userauth,
+            }
+        )
+        self._search_body_prefix = urllib.parse.urlencode(
+            {
+                "c3-scalefactor": self.config["c3_scalefactor"],
+                "c3-userlat": self.config["c3_userlat"],
+                "c3-userlong": self.config["c3_userlong"],
+                "c3-batterylevel": self.config["c3_batterylevel"],
+                "c3-language": self.config["c3_language"],
+                "c3-applysensitivedatacheck": self.config["c3_applysensitivedatacheck"],
+                "c3-userauth": self.c3_userauth,
+                "c3-controlvals": self.config["c3_controlvals"],
+                "c3-capabilities": self.config["c3_capabilities"],
+                "c3-deviceid": self.config["c3_deviceid"],
+                "postback": "1",
+                "format": "json",
+            }
+        )
+
     @property
     def active_token_info(self) -> Dict[str, Optional[str]]:
         return {
@@ -182,7 +548,7 @@ class TflCycleHireSDK:
     ) -> bool:
         if location_key not in self.static_location_data:
             sdk_logger.error(
-                f"Cannot prime tokens: Static Location key '{location_key}' not found."
+                "Cannot prime tokens: Static Location key '%s' not found.", location_key
             )
             return False
         loc_details = self.static_location_data[location_key]
@@ -191,12 +557,13 @@ class TflCycleHireSDK:
             self._active_original_c3_clienttime = loc_details["c3_clienttime"]
             self._active_token_source_info = f"static_example_for_{location_key}"
             sdk_logger.info(
-                f"SDK active tokens primed from static data for '{location_key}'."
+                "SDK active tokens primed from static data for '%s'.", location_key
             )
             return True
         else:
             sdk_logger.warning(
-                f"Cannot prime tokens: Missing token data for '{location_key}' in static_location_data."
+                "Cannot prime tokens: Missing token data for '%s' in static_location_data.",
+                location_key,
             )
             return False
 
@@ -209,20 +576,51 @@ class TflCycleHireSDK:
         self._active_c3_encoding = c3_encoding
         self._active_original_c3_clienttime = original_c3_clienttime
         self._active_token_source_info = source_info
-        sdk_logger.info(f"SDK active tokens explicitly set. Source: {source_info}.")
+        sdk_logger.info("SDK active tokens explicitly set. Source: %s.", source_info)
 
     def clear_active_tokens(self):
         self._active_c3_encoding = None
         self._active_original_c3_clienttime = None
         self._active_token_source_info = None
+        self.clear_search_cache()  # Results were fetched under the old identity
         sdk_logger.info("SDK active tokens cleared.")
 
+    def set_active_token_ttl(self, seconds: Optional[float]):
+        """
+        Sets how old the active client time may be before the original-time
+        strategy is skipped in favour of a fresh time; None always tries it.
+        """
+        self.config["active_token_ttl"] = seconds
+
+    def clear_search_cache(self):
+        """Forgets cached search_stations results, e.g. after rotating tokens."""
+        self._search_cache.clear()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def _encoded_confirm_hire_node(terminal_name: str, point_name_display: str) -> str:
+        """The form-encoded Node field value; cached like the XML it wraps."""
+        return urllib.parse.quote_plus(
+            TflCycleHireSDK._build_confirm_hire_node_xml(
+                terminal_name, point_name_display
+            )
+        )
+
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
     def _build_confirm_hire_node_xml(
-        self, terminal_name: str, point_name_display: str
+        terminal_name: str, point_name_display: str
     ) -> str:
-        point_name_encoded = point_name_display.replace(",", "%2C")
-        return self.NODE_XML_TEMPLATE_CONFIRM_HIRE.format(
-            terminal_name=terminal_name, point_name_encoded=point_name_encoded
+        # The node only depends on the station, so each one is rendered once.
+        cls = TflCycleHireSDK
+        return "".join(
+            (
+                cls._NODE_XML_HEAD,
+                terminal_name,
+                cls._NODE_XML_MID,
+                point_name_display.replace(",", "%2C"),
+                cls._NODE_XML_TAIL,
+            )
         )
 
     def _execute_confirm_hire_api_call(
@@ -231,44 +629,30 @@ class TflCycleHireSDK:
         point_name: str,
         c3_encoding: str,
         c3_clienttime: str,
-        timeout: int,
+        timeout: float,
     ) -> str:
-        headers = {
-            "Host": "ce-a22.corethree.net",
-            "Accept": "*/*",
-            "c3-encoding": c3_encoding,
-            "Accept-Language": self.config["accept_language"],
-        }
-        node_xml = self._build_confirm_hire_node_xml(terminal_name, point_name)
-        payload = {
-            "c3-clienttime": c3_clienttime,
-            "c3-language": self.config["c3_language"],
-            "c3-applysensitivedatacheck": self.config["c3_applysensitivedatacheck"],
-            "c3-scalefactor": self.config["c3_scalefactor"],
-            "Node": node_xml,
-            "c3-capabilities": self.config["c3_capabilities"],
-            "c3-batterylevel": self.config["c3_batterylevel"],
-            "c3-userlat": self.config["c3_userlat"],
-            "c3-deviceid": self.config["c3_deviceid"],
-            "c3-userlong": self.config["c3_userlong"],
-            "Event": self.config["event_name"],
-            "c3-controlvals": self.config["c3_controlvals"],
-            "c3-userauth": self.c3_userauth,
-        }
+        self._ensure_config_applied()
+        headers = {"c3-encoding": c3_encoding, "Content-Type": _FORM_CONTENT_TYPE}
+        body = (
+            f"{self._confirm_hire_body_prefix}"
+            f"&c3-clienttime={urllib.parse.quote_plus(c3_clienttime)}"
+            f"&Node={self._encoded_confirm_hire_node(terminal_name, point_name)}"
+        ).encode("ascii")
         sdk_logger.debug(
-            f"Executing Confirm Hire API call for: {point_name} (Terminal: {terminal_name})"
+            "Executing Confirm Hire API call for: %s (Terminal: %s)",
+            point_name,
+            terminal_name,
         )
         response_obj = None
         try:
             response_obj = self.session.post(
                 self.BASE_URL_WORKFLOWS,
                 headers=headers,
-                data=payload,
-                verify=False,
-                timeout=timeout,
+                data=body,
+                timeout=(min(self.CONNECT_TIMEOUT, timeout), timeout),
             )
             response_obj.raise_for_status()
-            data = response_obj.json()
+            data = _json_loads(response_obj.content)
         except requests.exceptions.HTTPError as http_err:
             raise TflCycleHireAPIError(
                 str(http_err),
@@ -277,29 +661,14 @@ class TflCycleHireSDK:
             ) from http_err
         except requests.exceptions.RequestException as req_err:
             raise TflCycleHireSDKError(f"Request failed: {req_err}") from req_err
-        except json.JSONDecodeError as json_err:
+        except ValueError as json_err:  # Covers json/orjson/ujson decode errors
             raise TflCycleHireAPIError(
                 "Failed to decode JSON response.",
                 getattr(response_obj, "status_code", None),
                 getattr(response_obj, "text", None),
             ) from json_err
 
-        release_code_found: Optional[str] = None
-        children = data.get("Children", [])
-        for child in children:
-            if (
-                child.get("Name") == "Your cycle hire release code:"
-                and "Subtitle" in child
-            ):
-                release_code_found = child.get("Subtitle")
-                break
-        if not release_code_found:
-            for child in children:
-                if child.get("ID", "").endswith("_unlockbar") and "Name" in child:
-                    match = re.search(r"Release code (\d+)", child.get("Name", ""))
-                    if match:
-                        release_code_found = match.group(1)
-                        break
+        release_code_found = _parse_release_code(data)
         if release_code_found:
             return release_code_found
         else:
@@ -307,17 +676,155 @@ class TflCycleHireSDK:
                 f"Could not find release code for {point_name}."
             )
 
+    def _active_token_strategies(
+        self,
+        try_active_original_time: bool,
+        try_active_fresh_time: bool,
+        fresh_time_source_info: str,
+    ) -> List[_TokenStrategy]:
+        """Lists the enabled strategies that reuse the SDK's active tokens."""
+        strategies: List[_TokenStrategy] = []
+        if not self._active_c3_encoding:
+            return strategies
+        original_time = self._active_original_c3_clienttime
+        ttl = self.config["active_token_ttl"]
+        if try_active_original_time and original_time and try_active_fresh_time:
+            age = _client_time_age(original_time) if ttl is not None else None
+            if age is not None and age > ttl:
+                sdk_logger.info(
+                    "Strategy (active original time) skipped (stale): client time "
+                    "is %.0fs old.",
+                    age,
+                )
+                try_active_original_time = False
+        if try_active_original_time and original_time:
+            strategies.append(
+                (
+                    "active original time",
+                    self._active_c3_encoding,
+                    original_time,
+                    None,
+                )
+            )
+        if try_active_fresh_time:
+            strategies.append(
+                (
+                    "active fresh time",
+                    self._active_c3_encoding,
+                    None,
+                    fresh_time_source_info,
+                )
+            )
+        return strategies
+
+    def _run_token_strategies(
+        self,
+        strategies: List[_TokenStrategy],
+        request: Callable[[str, str, float], _T],
+        timeout: float,
+        final_msg: str,
+        no_strategy_msg: str,
+        total_budget: Optional[float] = None,
+    ) -> _T:
+        """
+        Tries the strategies in order and returns the first success. With a
+        total_budget (seconds), later strategies only get the time that is left
+        and are skipped once it runs out.
+        """
+        if not strategies:
+            raise TflCycleHireConfigError(f"{final_msg} {no_strategy_msg}")
+        deadline = None if total_budget is None else time.monotonic() + total_budget
+        last_error: Optional[Exception] = None
+        for label, c3_encoding, c3_clienttime, source_info in strategies:
+            attempt_timeout = timeout
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    sdk_logger.warning(
+                        "Strategy time budget of %ss used up; skipping (%s) and any later strategies.",
+                        total_budget,
+                        label,
+                    )
+                    break
+                attempt_timeout = min(timeout, remaining)
+            if c3_clienttime is None:
+                c3_clienttime = _fresh_client_time()
+            sdk_logger.info(
+                "Strategy (%s): trying (client time %s).", label, c3_clienttime
+            )
+            try:
+                result = request(c3_encoding, c3_clienttime, attempt_timeout)
+            except Exception as e:
+                sdk_logger.warning("Strategy (%s) failed: %s", label, e)
+                last_error = e
+                continue
+            if source_info is not None:
+                self.set_active_tokens(c3_encoding, c3_clienttime, source_info)
+            return result
+        raise TflCycleHireSDKError(final_msg) from last_error
+
+    def _race_token_strategies(
+        self,
+        strategies: List[_TokenStrategy],
+        request: Callable[[str, str, float], _T],
+        timeout: float,
+        final_msg: str,
+        no_strategy_msg: str,
+        total_budget: Optional[float] = None,
+    ) -> _T:
+        """
+        Sends every strategy's request at once and returns the first success.
+        Losing attempts are left to finish in the background and ignored.
+        """
+        if not strategies:
+            raise TflCycleHireConfigError(f"{final_msg} {no_strategy_msg}")
+        if total_budget is not None:
+            timeout = min(timeout, total_budget)  # All attempts run side by side
+        fresh_client_time = _fresh_client_time()
+        strategies = [
+            (label, c3_encoding, c3_clienttime or fresh_client_time, source_info)
+            for label, c3_encoding, c3_clienttime, source_info in strategies
+        ]
+        sdk_logger.info(
+            "Strategy: Racing %d token strategies concurrently.", len(strategies)
+        )
+        executor = ThreadPoolExecutor(max_workers=len(strategies))
+        try:
+            futures = {
+                executor.submit(request, strategy[1], strategy[2], timeout): strategy
+                for strategy in strategies
+            }
+            last_error: Optional[Exception] = None
+            for future in as_completed(futures):
+                label, c3_encoding, c3_clienttime, source_info = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    sdk_logger.warning("Strategy (%s) failed: %s", label, e)
+                    last_error = e
+                    continue
+                for other in futures:
+                    other.cancel()
+                if source_info is not None:
+                    self.set_active_tokens(c3_encoding, c3_clienttime, source_info)
+                return result
+            raise TflCycleHireSDKError(final_msg) from last_error
+        finally:
+            executor.shutdown(wait=False)
+
     def get_release_code_with_explicit_tokens(
         self,
         terminal_name: str,
         point_name: str,
         c3_encoding: str,
         c3_clienttime: str,
-        timeout: int = 20,
+        timeout: float = 20,
         update_active_tokens_on_success: bool = True,
     ) -> str:
         sdk_logger.info(
-            f"Attempting code retrieval for '{point_name}' (Terminal: {terminal_name}) with explicit tokens."
+            "Attempting code retrieval for '%s' (Terminal: %s) with explicit tokens.",
+            point_name,
+            terminal_name,
         )
         code = self._execute_confirm_hire_api_call(
             terminal_name, point_name, c3_encoding, c3_clienttime, timeout
@@ -331,15 +838,24 @@ class TflCycleHireSDK:
     def get_release_code_for_static_location(
         self,
         location_key: StaticallyDefinedLocationKey,
-        timeout: int = 20,
+        timeout: float = 20,
         try_active_original_time: bool = True,
         try_active_fresh_time: bool = True,
         try_static_location_tokens: bool = True,
+        parallel_strategies: bool = False,
+        total_budget: Optional[float] = None,
     ) -> str:
+        """
+        With parallel_strategies=True the enabled strategies are sent at once and
+        the first success wins, so a stale token costs max(timeouts) rather than
+        their sum. Note this may send more than one Confirm Hire request.
+
+        total_budget caps the time (seconds) spent across all strategies;
+        `timeout` remains the per-request read timeout.
+        """
         sdk_logger.info(
-            f"Smart attempt for release code at static location '{location_key}'."
+            "Smart attempt for release code at static location '%s'.", location_key
         )
-        last_error: Optional[Exception] = None
         if location_key not in self.static_location_data:
             raise TflCycleHireConfigError(
                 f"Static location key '{location_key}' not found."
@@ -348,119 +864,71 @@ class TflCycleHireSDK:
         target_terminal_name = target_loc_details["terminal_name"]
         target_point_name = target_loc_details["point_name"]
 
-        if (
-            try_active_original_time
-            and self._active_c3_encoding
-            and self._active_original_c3_clienttime
-        ):
-            sdk_logger.info("Strategy: Trying active SDK tokens (original time).")
-            try:
-                return self._execute_confirm_hire_api_call(
-                    target_terminal_name,
-                    target_point_name,
-                    self._active_c3_encoding,
-                    self._active_original_c3_clienttime,
-                    timeout,
-                )
-            except Exception as e:
-                sdk_logger.warning(f"Strategy (active original time) failed: {e}")
-                last_error = e
-
-        if try_active_fresh_time and self._active_c3_encoding:
-            fresh_client_time = f"{time.time():.6f}"
-            sdk_logger.info(
-                f"Strategy: Trying active SDK encoding with FRESH time ({fresh_client_time})."
-            )
-            try:
-                code = self._execute_confirm_hire_api_call(
-                    target_terminal_name,
-                    target_point_name,
-                    self._active_c3_encoding,
-                    fresh_client_time,
-                    timeout,
-                )
-                self.set_active_tokens(
-                    self._active_c3_encoding,
-                    fresh_client_time,
-                    f"active_encoding_fresh_time_for_static_{location_key}",
-                )
-                return code
-            except Exception as e:
-                sdk_logger.warning(f"Strategy (active fresh time) failed: {e}")
-                last_error = e
-
+        # Strategies 1-2: active tokens (original, then fresh client time);
+        # Strategy 3: static/example tokens for the *target* location.
+        strategies = self._active_token_strategies(
+            try_active_original_time,
+            try_active_fresh_time,
+            f"active_encoding_fresh_time_for_static_{location_key}",
+        )
         if try_static_location_tokens:
             if (
                 "c3_encoding" in target_loc_details
                 and "c3_clienttime" in target_loc_details
             ):
-                sdk_logger.info(
-                    f"Strategy: Trying static/example tokens for target static location '{location_key}'."
-                )
-                try:
-                    code = self._execute_confirm_hire_api_call(
-                        target_terminal_name,
-                        target_point_name,
-                        target_loc_details["c3_encoding"],
-                        target_loc_details["c3_clienttime"],
-                        timeout,
-                    )
-                    self.set_active_tokens(
+                strategies.append(
+                    (
+                        "static location tokens",
                         target_loc_details["c3_encoding"],
                         target_loc_details["c3_clienttime"],
                         f"static_example_for_{location_key}",
                     )
-                    return code
-                except Exception as e:
-                    sdk_logger.warning(f"Strategy (static location tokens) failed: {e}")
-                    last_error = e
+                )
             else:
                 sdk_logger.warning(
-                    f"Strategy (static location tokens): Missing token data for '{location_key}'."
+                    "Strategy (static location tokens): Missing token data for '%s'.",
+                    location_key,
                 )
 
-        final_msg = f"All token strategies failed for static location '{location_key}'."
-        if last_error:
-            raise TflCycleHireSDKError(final_msg) from last_error
-        else:
-            raise TflCycleHireConfigError(
-                final_msg + " No valid strategies enabled or configured."
-            )
+        run = (
+            self._race_token_strategies
+            if parallel_strategies
+            else self._run_token_strategies
+        )
+        return run(
+            strategies,
+            functools.partial(
+                self._execute_confirm_hire_api_call,
+                target_terminal_name,
+                target_point_name,
+            ),
+            timeout,
+            f"All token strategies failed for static location '{location_key}'.",
+            "No valid strategies enabled or configured.",
+            total_budget,
+        )
 
     def _execute_search_api_call(
-        self, search_text: str, c3_encoding: str, c3_clienttime: str, timeout: int
+        self, search_text: str, c3_encoding: str, c3_clienttime: str, timeout: float
     ) -> List[SearchedStationInfo]:
         search_url = f"{self.BASE_URL_CLIENTS_TFL}/GenerateLCHSDynamicSearch"
-        headers = {
-            "Host": "ce-a22.corethree.net",
-            "Accept": "*/*",
-            "c3-encoding": c3_encoding,
-            "Accept-Language": self.config["accept_language"],
-        }
-        payload = {
-            "c3-clienttime": c3_clienttime,
-            "c3-scalefactor": self.config["c3_scalefactor"],
-            "c3-userlat": self.config["c3_userlat"],
-            "c3-userlong": self.config["c3_userlong"],
-            "c3-batterylevel": self.config["c3_batterylevel"],
-            "c3-language": self.config["c3_language"],
-            "c3-applysensitivedatacheck": self.config["c3_applysensitivedatacheck"],
-            "c3-userauth": self.c3_userauth,
-            "c3-controlvals": self.config["c3_controlvals"],
-            "c3-capabilities": self.config["c3_capabilities"],
-            "c3-deviceid": self.config["c3_deviceid"],
-            "lchs_search_text": search_text,
-            "postback": "1",
-            "format": "json",
-        }
-        sdk_logger.debug(f"Executing Search API call for: '{search_text}'")
+        self._ensure_config_applied()
+        headers = {"c3-encoding": c3_encoding, "Content-Type": _FORM_CONTENT_TYPE}
+        body = (
+            f"{self._search_body_prefix}"
+            f"&c3-clienttime={urllib.parse.quote_plus(c3_clienttime)}"
+            f"&lchs_search_text={urllib.parse.quote_plus(search_text)}"
+        ).encode("ascii")
+        sdk_logger.debug("Executing Search API call for: '%s'", search_text)
         response_obj = None
         try:
             response_obj = self.session.post(
-                search_url, headers=headers, data=payload, verify=False, timeout=timeout
+                search_url,
+                headers=headers,
+                data=body,
+                timeout=(min(self.CONNECT_TIMEOUT, timeout), timeout),
             )
             response_obj.raise_for_status()
-            data = response_obj.json()
         except requests.exceptions.HTTPError as http_err:
             raise TflCycleHireAPIError(
                 str(http_err),
@@ -471,72 +939,37 @@ class TflCycleHireSDK:
             raise TflCycleHireSDKError(
                 f"Search station API call unexpected error: {e}"
             ) from e
-        results: List[SearchedStationInfo] = []
-        children = data.get("Children", [])
-        station_data_aggregator: Dict[str, Dict[str, Any]] = {}
-        for child in children:
-            child_type = child.get("Type")
-            child_id_str = child.get("ID", "")
-            id_match = re.match(r"^(lchs_searchresult_(\d+))", child_id_str)
-            if not id_match:
-                continue
-            station_id_prefix = id_match.group(1)
-            parsed_station_id = id_match.group(2)
-            if station_id_prefix not in station_data_aggregator:
-                station_data_aggregator[station_id_prefix] = {
-                    "raw_station_id_from_id": parsed_station_id
-                }
-            current_station_entry = station_data_aggregator[station_id_prefix]
-            if child_type == "Node.Link":
-                current_station_entry["name"] = child.get("Name")
-                current_station_entry["subtitle"] = child.get("Subtitle")
-                tags = child.get("Tags", {})
-                current_station_entry["dock_location"] = tags.get("LCHS.DockLocation")
-                if tags.get("LCHS.StationID"):
-                    current_station_entry["station_id_from_link_tags"] = tags.get(
-                        "LCHS.StationID"
-                    )
-            elif child_type == "Node.Media.Image" and child.get("Name") == "Hire now":
-                tags = child.get("Tags", {})
-                current_station_entry["terminal_name_from_image_tags"] = tags.get(
-                    "Terminal"
-                )
-                current_station_entry["point_name_from_image_tags"] = tags.get(
-                    "PointName"
-                )
-                if tags.get("StationID"):
-                    current_station_entry["station_id_from_image_tags"] = tags.get(
-                        "StationID"
-                    )
-        for prefix, collected_details in station_data_aggregator.items():
-            station_id = (
-                collected_details.get("station_id_from_image_tags")
-                or collected_details.get("station_id_from_link_tags")
-                or collected_details.get("raw_station_id_from_id")
-            )
-            name = collected_details.get("name")
-            point_name = collected_details.get("point_name_from_image_tags") or name
-            terminal_name = collected_details.get("terminal_name_from_image_tags")
-            if station_id and name and point_name:
-                results.append({"station_id": station_id, "name": name, "subtitle": collected_details.get("subtitle", "N/A"), "terminal_name": terminal_name, "point_name": point_name, "dock_location": collected_details.get("dock_location")})  # type: ignore
-            else:
-                sdk_logger.warning(
-                    f"Skipping search result (prefix {prefix}): missing core data: {collected_details}"
-                )
-        return results
+        try:
+            data = _json_loads(response_obj.content)
+        except ValueError as json_err:  # Covers json/orjson/ujson decode errors
+            raise TflCycleHireAPIError(
+                "Failed to decode search JSON response.",
+                response_obj.status_code,
+                response_obj.text,
+            ) from json_err
+        return _parse_search_response(data)
 
     def search_stations(
         self,
         search_text: str,
-        timeout: int = 15,
+        timeout: float = 15,
         c3_encoding_override: Optional[str] = None,
         c3_clienttime_override: Optional[str] = None,
         try_active_original_time: bool = True,
         try_active_fresh_time: bool = True,
         prime_from_static_if_no_active: Optional[StaticallyDefinedLocationKey] = None,
+        parallel_strategies: bool = False,
+        total_budget: Optional[float] = None,
     ) -> List[SearchedStationInfo]:
-        sdk_logger.info(f"Smart search for stations: '{search_text}'")
-        last_error: Optional[Exception] = None
+        sdk_logger.info("Smart search for stations: '%s'", search_text)
+        # Explicit override tokens are always sent, so the caller learns whether they work.
+        if not (c3_encoding_override and c3_clienttime_override):
+            cached = self._search_cache.get(search_text.lower())
+            if cached is not None:
+                sdk_logger.info(
+                    "Search served from cache. Found %d stations.", len(cached)
+                )
+                return list(cached)
         if c3_encoding_override and c3_clienttime_override:
             sdk_logger.info(
                 "Strategy (Search): Using EXPLICITLY provided override tokens."
@@ -551,91 +984,70 @@ class TflCycleHireSDK:
                     f"explicit_override_for_search_{search_text}",
                 )
                 sdk_logger.info(
-                    f"Search successful with explicit tokens. Found {len(results)} stations."
+                    "Search successful with explicit tokens. Found %d stations.",
+                    len(results),
                 )
                 return results
             except Exception as e:
-                sdk_logger.error(f"Strategy (explicit override for search) failed: {e}")
+                sdk_logger.error(
+                    "Strategy (explicit override for search) failed: %s", e
+                )
                 raise TflCycleHireSDKError(
                     f"Explicit token override failed for search '{search_text}'."
                 ) from e
         if prime_from_static_if_no_active and not self._active_c3_encoding:
             sdk_logger.info(
-                f"No active SDK tokens. Priming from static location '{prime_from_static_if_no_active}' for search."
+                "No active SDK tokens. Priming from static location '%s' for search.",
+                prime_from_static_if_no_active,
             )
             if not self.prime_tokens_from_static_location(
                 prime_from_static_if_no_active
             ):
                 sdk_logger.warning(
-                    f"Failed to prime tokens from '{prime_from_static_if_no_active}'."
-                )
-        if (
-            try_active_original_time
-            and self._active_c3_encoding
-            and self._active_original_c3_clienttime
-        ):
-            sdk_logger.info(
-                "Strategy (Search): Trying active SDK tokens (original time)."
-            )
-            try:
-                results = self._execute_search_api_call(
-                    search_text,
-                    self._active_c3_encoding,
-                    self._active_original_c3_clienttime,
-                    timeout,
-                )
-                sdk_logger.info(
-                    f"Search successful with active (original time) tokens. Found {len(results)} stations."
-                )
-                return results
-            except Exception as e:
-                sdk_logger.warning(
-                    f"Strategy (active original time for search) failed: {e}"
-                )
-                last_error = e
-        if try_active_fresh_time and self._active_c3_encoding:
-            fresh_client_time = f"{time.time():.6f}"
-            sdk_logger.info(
-                f"Strategy (Search): Trying active SDK encoding with FRESH time ({fresh_client_time})."
-            )
-            try:
-                results = self._execute_search_api_call(
-                    search_text, self._active_c3_encoding, fresh_client_time, timeout
-                )
-                self.set_active_tokens(
-                    self._active_c3_encoding,
-                    fresh_client_time,
-                    f"active_encoding_fresh_time_for_search_{search_text}",
-                )
-                sdk_logger.info(
-                    f"Search successful with active encoding (fresh time). Found {len(results)} stations."
-                )
-                return results
-            except Exception as e:
-                sdk_logger.warning(
-                    f"Strategy (active fresh time for search) failed: {e}"
+                    "Failed to prime tokens from '%s'.", prime_from_static_if_no_active
                 )
-                last_error = e
-        final_msg = f"All token strategies failed for search_stations with query '{search_text}'."
-        if last_error:
-            raise TflCycleHireSDKError(final_msg) from last_error
-        else:
-            raise TflCycleHireConfigError(
-                final_msg
-                + " No token strategies enabled or active/primeable tokens available."
-            )
+        run = (
+            self._race_token_strategies
+            if parallel_strategies
+            else self._run_token_strategies
+        )
+        results = run(
+            self._active_token_strategies(
+                try_active_original_time,
+                try_active_fresh_time,
+                f"active_encoding_fresh_time_for_search_{search_text}",
+            ),
+            functools.partial(self._execute_search_api_call, search_text),
+            timeout,
+            f"All token strategies failed for search_stations with query '{search_text}'.",
+            "No token strategies enabled or active/primeable tokens available.",
+            total_budget,
+        )
+        sdk_logger.info("Search successful. Found %d stations.", len(results))
+        # A copy, so a caller mutating the returned list leaves the cache intact.
+        self._search_cache.put(search_text.lower(), list(results))
+        return results
 
     def get_release_code_for_searched_station(
         self,
         station_info: SearchedStationInfo,
-        timeout: int = 20,
+        timeout: float = 20,
         c3_encoding_override: Optional[str] = None,
         c3_clienttime_override: Optional[str] = None,
         try_active_original_time: bool = True,
         try_active_fresh_time: bool = True,
+        parallel_strategies: bool = False,
+        total_budget: Optional[float] = None,
     ) -> str:
+        """
+        parallel_strategies behaves as for get_release_code_for_static_location:
+        the active-token strategies race and the first success wins, at the cost
+        of possibly sending more than one Confirm Hire request.
+        """
         sdk_logger.info(
-            f"Attempting release code for searched station: '{station_info['name']}' (ID: {station_info['station_id']})"
+            "Attempting release code for searched station: '%s' (ID: %s)",
+            station_info["name"],
+            station_info["station_id"],
         )
         if not station_info.get("terminal_name"):
             raise TflCycleHireConfigError(
@@ -643,7 +1055,6 @@ class TflCycleHireSDK:
             )
         target_terminal_name = station_info["terminal_name"]
         target_point_name = station_info["point_name"]
-        last_error: Optional[Exception] = None
         if c3_encoding_override and c3_clienttime_override:
             sdk_logger.info(
                 "Strategy: Using EXPLICIT override tokens for searched station."
@@ -663,92 +1074,124 @@ class TflCycleHireSDK:
                 )
                 return code
             except Exception as e:
-                sdk_logger.error(f"Strategy (explicit override) failed: {e}")
+                sdk_logger.error("Strategy (explicit override) failed: %s", e)
                 raise TflCycleHireSDKError(
                     f"Explicit token override failed for {station_info['name']}."
                 ) from e
-        if (
-            try_active_original_time
-            and self._active_c3_encoding
-            and self._active_original_c3_clienttime
-        ):
-            sdk_logger.info(
-                "Strategy: Trying active SDK tokens (original time) for searched station."
-            )
-            try:
-                return self._execute_confirm_hire_api_call(
-                    target_terminal_name,
-                    target_point_name,
-                    self._active_c3_encoding,
-                    self._active_original_c3_clienttime,
-                    timeout,
-                )
-            except Exception as e:
-                sdk_logger.warning(f"Strategy (active original time) failed: {e}")
-                last_error = e
-        if try_active_fresh_time and self._active_c3_encoding:
-            fresh_client_time = f"{time.time():.6f}"
-            sdk_logger.info(
-                f"Strategy: Trying active SDK encoding with FRESH time ({fresh_client_time}) for searched station."
-            )
-            try:
-                code = self._execute_confirm_hire_api_call(
-                    target_terminal_name,
-                    target_point_name,
-                    self._active_c3_encoding,
-                    fresh_client_time,
-                    timeout,
-                )
-                self.set_active_tokens(
-                    self._active_c3_encoding,
-                    fresh_client_time,
-                    f"active_encoding_fresh_time_for_searched_{station_info['name']}",
-                )
-                return code
-            except Exception as e:
-                sdk_logger.warning(f"Strategy (active fresh time) failed: {e}")
-                last_error = e
-        final_msg = f"All smart token strategies failed for searched station '{station_info['name']}'."
-        if last_error:
-            raise TflCycleHireSDKError(final_msg) from last_error
-        else:
-            raise TflCycleHireConfigError(
-                final_msg + " No token strategies enabled or active tokens available."
-            )
+        run = (
+            self._race_token_strategies
+            if parallel_strategies
+            else self._run_token_strategies
+        )
+        return run(
+            self._active_token_strategies(
+                try_active_original_time,
+                try_active_fresh_time,
+                f"active_encoding_fresh_time_for_searched_{station_info['name']}",
+            ),
+            functools.partial(
+                self._execute_confirm_hire_api_call,
+                target_terminal_name,
+                target_point_name,
+            ),
+            timeout,
+            f"All smart token strategies failed for searched station '{station_info['name']}'.",
+            "No token strategies enabled or active tokens available.",
+            total_budget,
+        )
+
+    def get_release_codes_bulk(
+        self,
+        stations: List[SearchedStationInfo],
+        max_workers: int = 8,
+        **kwargs: Any,
+    ) -> Dict[str, Union[str, Exception]]:
+        """
+        Gets release codes for several searched stations concurrently over the
+        pooled session. Each station is a real Confirm Hire request, exactly as
+        if get_release_code_for_searched_station were called in a loop.
+
+        Returns a dict of station_id -> release code, or the exception raised
+        for that station. kwargs are passed on to
+        get_release_code_for_searched_station.
+        """
+        results: Dict[str, Union[str, Exception]] = {}
+        if not stations:
+            return results
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(stations), self.POOL_MAXSIZE)
+        ) as executor:
+            futures = {
+                executor.submit(
+                    self.get_release_code_for_searched_station, station, **kwargs
+                ): station["station_id"]
+                for station in stations
+            }
+            for future in as_completed(futures):
+                station_id = futures[future]
+                try:
+                    results[station_id] = future.result()
+                except Exception as e:
+                    sdk_logger.warning(
+                        "Bulk release code for station %s failed: %s", station_id, e
+                    )
+                    results[station_id] = e
+        return results
 
 
 # --- END OF TflCycleHireSDK Class ---
 
 
 # --- Streamlit App ---
+@st.cache_resource
+def get_shared_http_session() -> requests.Session:
+    """
+    One pooled HTTP session per server process, so keep-alive connections
+    survive reruns and are shared by every browser session.
+    """
+    return TflCycleHireSDK.build_session()
+
+
 def get_sdk_instance() -> TflCycleHireSDK:
     """Initializes or retrieves the SDK instance from session state."""
     if "sdk" not in st.session_state:
-        st.session_state.sdk = TflCycleHireSDK()
+        # Tokens stay per browser session (the sidebar manages them); only the
+        # connection pool is shared.
+        st.session_state.sdk = TflCycleHireSDK(session=get_shared_http_session())
         # Optionally, prime tokens on first load if desired
         # st.session_state.sdk.prime_tokens_from_static_location("cromer_street")
     return st.session_state.sdk
 
 
-def main_app():
-    st.set_page_config(page_title="TfL Cycle Hire Assistant", layout="wide")
-    st.title("🚲 TfL Cycle Hire Assistant (Experimental)")
-    st.markdown(
-        """
-    This app uses an experimental SDK to interact with certain TfL Cycle Hire API functions.
-    **IMPORTANT:** The token reusability observed is based on limited tests with specific example tokens
-    and is **NOT GUARANTEED** to work long-term or for all users/tokens.
-    """
+# Identical searches from any browser session are served from Streamlit's data
+# cache for a few minutes. Failed searches raise, and exceptions are never cached.
+# Searches with override tokens bypass it: those are always sent (see
+# search_stations), and the tokens must not end up in a cross-session cache key.
+@st.cache_data(ttl=300, max_entries=128, show_spinner=False)
+def cached_search_stations(
+    normalized_query: str,
+    _search_text: str,
+    _sdk: TflCycleHireSDK,
+) -> List[SearchedStationInfo]:
+    # The leading underscores keep Streamlit from hashing the raw text and the
+    # SDK; normalized_query is the cache key.
+    return _sdk.search_stations(
+        _search_text, prime_from_static_if_no_active="cromer_street"
     )
 
-    sdk = get_sdk_instance()
 
-    # --- Sidebar for SDK State and Token Management ---
-    with st.sidebar:
-        st.header("SDK Token Management")
-        st.caption("Controls the SDK's active `c3_encoding` and `c3_clienttime`.")
+def _lazy_expander(label: str, key: str):
+    # Tracks the open state (and reruns on toggle) so callers can skip building
+    # the contents while it is collapsed. Older releases have no on_change and
+    # always get the contents.
+    try:
+        return st.expander(label, key=key, on_change="rerun")
+    except TypeError:
+        return st.expander(label)
+
 
-        active_tokens = sdk.active_token_info
+def _render_token_status(placeholder, active_tokens: Dict[str, Optional[str]]):
+    with placeholder.container():
         if active_tokens.get("c3_encoding"):
             st.success(
                 f"Active Encoding (partial): `{active_tokens['c3_encoding'][:15]}...`"
@@ -760,37 +1203,70 @@ def main_app():
         else:
             st.info("No active tokens set in SDK.")
 
-        st.subheader("Prime Active Tokens from Static Data")
-        static_loc_to_prime = st.selectbox(
-            "Select static location to prime tokens from:",
-            options=list(sdk.static_location_data.keys()),
-            key="prime_loc_select",
-        )
-        if st.button("Prime Tokens", key="prime_button"):
-            if sdk.prime_tokens_from_static_location(static_loc_to_prime):  # type: ignore
-                st.success(f"SDK tokens primed from {static_loc_to_prime}.")
-                st.experimental_rerun()  # Rerun to update display
-            else:
-                st.error("Failed to prime tokens.")
-
-        if st.button("Clear Active Tokens", key="clear_tokens_button"):
-            sdk.clear_active_tokens()
-            st.info("Active SDK tokens cleared.")
-            st.experimental_rerun()
-
-        st.markdown("---")
-        st.subheader("Explicitly Set Active Tokens")
-        exp_c3_encoding = st.text_input("c3_encoding (for SDK)", key="exp_enc_sdk")
-        exp_c3_clienttime = st.text_input("c3_clienttime (for SDK)", key="exp_time_sdk")
-        if st.button("Set These Active Tokens", key="set_exp_tokens_sdk"):
-            if exp_c3_encoding and exp_c3_clienttime:
-                sdk.set_active_tokens(
-                    exp_c3_encoding, exp_c3_clienttime, "streamlit_explicit_set"
-                )
-                st.success("Explicit tokens set as active in SDK.")
-                st.experimental_rerun()
-            else:
-                st.warning("Both encoding and client time must be provided.")
+
+# Streamlit >= 1.37 has st.fragment; older releases only the experimental name.
+_fragment = (
+    getattr(st, "fragment", None)
+    or getattr(st, "experimental_fragment", None)
+    or (lambda func: func)
+)
+
+
+# --- Sidebar for SDK State and Token Management ---
+# A fragment: priming, clearing or setting tokens reruns only the sidebar.
+@_fragment
+def render_token_sidebar(sdk: TflCycleHireSDK):
+    st.header("SDK Token Management")
+    st.caption("Controls the SDK's active `c3_encoding` and `c3_clienttime`.")
+
+    # Filled in last, once the actions below have had a chance to change the tokens.
+    token_status = st.empty()
+
+    st.subheader("Prime Active Tokens from Static Data")
+    static_loc_to_prime = st.selectbox(
+        "Select static location to prime tokens from:",
+        options=sdk.static_location_keys,
+        key="prime_loc_select",
+    )
+    if st.button("Prime Tokens", key="prime_button"):
+        if sdk.prime_tokens_from_static_location(static_loc_to_prime):  # type: ignore
+            st.success(f"SDK tokens primed from {static_loc_to_prime}.")
+        else:
+            st.error("Failed to prime tokens.")
+
+    if st.button("Clear Active Tokens", key="clear_tokens_button"):
+        sdk.clear_active_tokens()  # Also clears the SDK's own search cache
+        cached_search_stations.clear()
+        st.info("Active SDK tokens cleared.")
+
+    st.markdown("---")
+    st.subheader("Explicitly Set Active Tokens")
+    exp_c3_encoding = st.text_input("c3_encoding (for SDK)", key="exp_enc_sdk")
+    exp_c3_clienttime = st.text_input("c3_clienttime (for SDK)", key="exp_time_sdk")
+    if st.button("Set These Active Tokens", key="set_exp_tokens_sdk"):
+        if exp_c3_encoding and exp_c3_clienttime:
+            sdk.set_active_tokens(
+                exp_c3_encoding, exp_c3_clienttime, "streamlit_explicit_set"
+            )
+            st.success("Explicit tokens set as active in SDK.")
+        else:
+            st.warning("Both encoding and client time must be provided.")
+
+    _render_token_status(token_status, sdk.active_token_info)
+
+
+def main_app():
+    st.set_page_config(page_title="TfL Cycle Hire Assistant", layout="wide")
+    st.title("🚲 TfL Cycle Hire Assistant (Experimental)")
+    st.markdown(
+        """
+    This app uses an experimental SDK to interact with certain TfL Cycle Hire API functions.
+    **IMPORTANT:** The token reusability observed is based on limited tests with specific example tokens
+    and is **NOT GUARANTEED** to work long-term or for all users/tokens.
+    """
+    )
+
+    sdk = get_sdk_instance()
 
     # --- Main App Area ---
     col1, col2 = st.columns(2)
@@ -806,14 +1282,20 @@ def main_app():
             "<small>Optional: Override tokens for this search action</small>",
             unsafe_allow_html=True,
         )
-        search_override_expander = st.expander("Search Token Overrides")
-        with search_override_expander:
-            search_c3_enc_override = st.text_input(
-                "Search c3_encoding override", key="search_enc_override"
-            )
-            search_c3_time_override = st.text_input(
-                "Search c3_clienttime override", key="search_time_override"
-            )
+        search_override_expander = _lazy_expander(
+            "Search Token Overrides", key="search_override_expander"
+        )
+        search_c3_enc_override = search_c3_time_override = ""
+        # The inputs only exist while the expander is open; closing it drops
+        # the overrides.
+        if getattr(search_override_expander, "open", None) is not False:
+            with search_override_expander:
+                search_c3_enc_override = st.text_input(
+                    "Search c3_encoding override", key="search_enc_override"
+                )
+                search_c3_time_override = st.text_input(
+                    "Search c3_clienttime override", key="search_time_override"
+                )
 
         if st.button("Search", key="search_button"):
             if not search_query:
@@ -823,55 +1305,71 @@ def main_app():
                     try:
                         # Use override tokens if provided, otherwise SDK uses its smart strategy
                         # (which might use active tokens or need priming)
-                        if search_c3_enc_override and search_c3_time_override:
+                        use_overrides = bool(
+                            search_c3_enc_override and search_c3_time_override
+                        )
+                        search_text = search_query.strip()
+                        if use_overrides:
                             results = sdk.search_stations(
-                                search_query,
+                                search_text,
                                 c3_encoding_override=search_c3_enc_override,
                                 c3_clienttime_override=search_c3_time_override,
                             )
                         else:
-                            # If no active tokens, tell search to try priming from a default
-                            results = sdk.search_stations(
-                                search_query,
-                                prime_from_static_if_no_active="cromer_street",
+                            if not sdk.active_token_info["c3_encoding"]:
+                                # A cache hit skips the SDK call that would prime
+                                # these, and Get Code needs them.
+                                sdk.prime_tokens_from_static_location("cromer_street")
+                            results = cached_search_stations(
+                                search_text.lower(), search_text, sdk
                             )
 
                         st.session_state.search_results = (
                             results  # Store in session state
                         )
+                        # Derived once per search rather than on every rerun.
+                        st.session_state.station_options = {
+                            f"{res['name']} ({res['subtitle']})": res
+                            for res in results
+                            if res["terminal_name"]
+                        }
                         if not results:
                             st.info(f"No stations found for '{search_query}'.")
-                        st.experimental_rerun()  # Rerun to display results
+                        # The results block below renders them in this same run.
                     except TflCycleHireSDKError as e:
                         st.error(f"Search failed: {e}")
                         st.session_state.search_results = []  # Clear old results
+                        st.session_state.station_options = {}
                     except Exception as e:
                         st.error(f"An unexpected error occurred during search: {e}")
                         st.session_state.search_results = []
+                        st.session_state.station_options = {}
 
-        if "search_results" in st.session_state and st.session_state.search_results:
+        # None before the first search; an empty list after one that found
+        # nothing, whose message the search button logic has already shown.
+        if st.session_state.get("search_results"):
             st.subheader("Search Results")
-            results = st.session_state.search_results
-
-            hirable_stations = [res for res in results if res["terminal_name"]]
+            # Hirable results (those with a TerminalName), keyed by display name.
+            station_options = st.session_state.get("station_options", {})
 
-            if not hirable_stations:
+            if not station_options:
                 st.info(
                     "No directly hirable stations found in search results (missing TerminalName)."
                 )
             else:
-                # Create display names for the selectbox
-                station_options = {
-                    f"{res['name']} ({res['subtitle']})": res
-                    for res in hirable_stations
-                }
-                selected_station_display_name = st.selectbox(
-                    "Select a hirable station from search:",
-                    options=list(station_options.keys()),
-                    key="searched_station_select",
-                )
+                # A form: changing the selection does not rerun the script; only
+                # the submit button does.
+                with st.form("searched_code_form"):
+                    selected_station_display_name = st.selectbox(
+                        "Select a hirable station from search:",
+                        options=list(station_options.keys()),
+                        key="searched_station_select",
+                    )
+                    get_code_submitted = st.form_submit_button(
+                        "Get Code for Searched Station", key="get_code_searched"
+                    )
 
-                if selected_station_display_name:
+                if get_code_submitted and selected_station_display_name:
                     selected_searched_station: SearchedStationInfo = station_options[
                         selected_station_display_name
                     ]
@@ -879,40 +1377,36 @@ def main_app():
                         selected_searched_station  # Store the object
                     )
 
-                    if st.button(
-                        "Get Code for Searched Station", key="get_code_searched"
+                    with st.spinner(
+                        f"Getting code for {selected_searched_station['name']}..."
                     ):
-                        with st.spinner(
-                            f"Getting code for {selected_searched_station['name']}..."
-                        ):
-                            try:
-                                # This method uses SDK's active token strategies
-                                code = sdk.get_release_code_for_searched_station(
-                                    selected_searched_station
-                                )
-                                st.success(
-                                    f"Release Code for {selected_searched_station['name']}: **{code}**"
-                                )
-                                st.balloons()
-                            except TflCycleHireSDKError as e:
-                                st.error(f"Failed to get code: {e}")
-                            except Exception as e:
-                                st.error(f"An unexpected error: {e}")
-        elif (
-            "search_results" in st.session_state and not st.session_state.search_results
-        ):  # Search was run but no results
-            pass  # Message already shown by search button logic
+                        try:
+                            # This method uses SDK's active token strategies
+                            code = sdk.get_release_code_for_searched_station(
+                                selected_searched_station
+                            )
+                            st.success(
+                                f"Release Code for {selected_searched_station['name']}: **{code}**"
+                            )
+                            st.balloons()
+                        except TflCycleHireSDKError as e:
+                            st.error(f"Failed to get code: {e}")
+                        except Exception as e:
+                            st.error(f"An unexpected error: {e}")
 
     with col2:
         st.header("Get Code for Static Location")
-        static_loc_options = list(sdk.static_location_data.keys())
-        selected_static_loc_key = st.selectbox(
-            "Select a pre-defined static location:",
-            options=static_loc_options,
-            key="static_loc_select",
-        )
+        with st.form("static_code_form"):
+            selected_static_loc_key = st.selectbox(
+                "Select a pre-defined static location:",
+                options=sdk.static_location_keys,
+                key="static_loc_select",
+            )
+            static_code_submitted = st.form_submit_button(
+                "Get Code for Static Location", key="get_code_static"
+            )
 
-        if st.button("Get Code for Static Location", key="get_code_static"):
+        if static_code_submitted:
             if selected_static_loc_key:
                 loc_name = sdk.static_location_data[selected_static_loc_key]["point_name"]  # type: ignore
                 with st.spinner(f"Getting code for {loc_name}..."):
@@ -930,6 +1424,11 @@ def main_app():
         "App uses an SDK that relies on observed API behavior. Functionality may change."
     )
 
+    # Drawn last so its token status reflects any search or code request above;
+    # the sidebar's position on the page does not depend on call order.
+    with st.sidebar:
+        render_token_sidebar(sdk)
+
 
 if __name__ == "__main__":
     main_app()